@@ -0,0 +1,41 @@
+"""Add item geohash
+
+Revision ID: a1c4e7d2b9f0
+Revises: 83510be2f621
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.geohash import GEOHASH_PRECISION, encode
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e7d2b9f0'
+down_revision = '83510be2f621'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        f'ALTER TABLE items ADD COLUMN IF NOT EXISTS geohash VARCHAR({GEOHASH_PRECISION}) COLLATE "C"'
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_items_geohash ON items (geohash)")
+
+    # Backfill cell keys for rows created before the column existed
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, latitude, longitude FROM items WHERE geohash IS NULL")
+    ).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE items SET geohash = :geohash WHERE id = :id"),
+            [{"geohash": encode(row.latitude, row.longitude), "id": row.id} for row in rows],
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_items_geohash")
+    op.execute("ALTER TABLE items DROP COLUMN IF EXISTS geohash")
@@ -0,0 +1,36 @@
+"""Add item full-text search
+
+Revision ID: b7d3f19e6a25
+Revises: a1c4e7d2b9f0
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f19e6a25'
+down_revision = 'a1c4e7d2b9f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE items ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_items_search_vector ON items USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_items_title_trgm ON items USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_items_title_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_items_search_vector")
+    op.execute("ALTER TABLE items DROP COLUMN IF EXISTS search_vector")
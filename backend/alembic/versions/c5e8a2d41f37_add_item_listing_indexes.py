@@ -0,0 +1,40 @@
+"""Add item listing indexes
+
+Revision ID: c5e8a2d41f37
+Revises: b7d3f19e6a25
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e8a2d41f37'
+down_revision = 'b7d3f19e6a25'
+branch_labels = None
+depends_on = None
+
+
+# Every listing pages by (sort key, id), so each index ends in the same pair and
+# serves both the equality filter and the keyset order without a sort step
+INDEXES = {
+    "ix_items_start_date_id": "(start_date, id)",
+    "ix_items_created_at_id": "(created_at, id)",
+    "ix_items_category_start_date": "(category, start_date, id)",
+    "ix_items_type_start_date": "(type, start_date, id)",
+    "ix_items_user_id_start_date": "(user_id, start_date, id)",
+}
+
+
+def upgrade() -> None:
+    # Build without locking writes; CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON items {columns}")
+    op.execute("ANALYZE items")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,41 @@
+"""Add item time window indexes
+
+Revision ID: d1a7c3f95b28
+Revises: c5e8a2d41f37
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1a7c3f95b28'
+down_revision = 'c5e8a2d41f37'
+branch_labels = None
+depends_on = None
+
+
+# Listings leave out ended items by default and time windows are overlap tests
+# (end_date >= window start, start_date <= window end):
+# - (end_date, start_date) answers counts and watermarks over a window from the index alone
+# - the duration index makes max(end_date - start_date) a single index probe, which bounds
+#   start_date from below so start_date-ordered pages skip ended history
+INDEXES = {
+    "ix_items_end_date_start_date": "(end_date, start_date)",
+    "ix_items_duration": "((end_date - start_date))",
+}
+
+
+def upgrade() -> None:
+    # Build without locking writes; CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON items {columns}")
+    # Expression indexes get their own statistics
+    op.execute("ANALYZE items")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
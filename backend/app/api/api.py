@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, items, uploads
+from app.api.endpoints import auth, health, items, uploads
 
 # Main API router
 api_router = APIRouter()
@@ -9,3 +9,4 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
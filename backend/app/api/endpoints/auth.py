@@ -4,11 +4,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash
+from app.core.security import create_access_token, get_password_hash_async
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
-from app.middleware.auth import authenticate_user, get_current_user
+from app.middleware.auth import authenticate_user, get_current_user, get_user_by_email, invalidate_user_cache
 
 
 router = APIRouter()
@@ -37,10 +37,7 @@ async def login(
 
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def signup(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
-    query = await db.execute(User.__table__.select().where(User.email == user_in.email))
-    user = query.scalar_one_or_none()
-    
-    if user:
+    if await get_user_by_email(db, user_in.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -49,7 +46,7 @@ async def signup(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     new_user = User(
         email=user_in.email,
         name=user_in.name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
     )
     
     db.add(new_user)
@@ -78,11 +75,12 @@ async def update_profile(
 ):
     for field, value in user_update.items():
         if field == "password":
-            setattr(current_user, "hashed_password", get_password_hash(value))
+            setattr(current_user, "hashed_password", await get_password_hash_async(value))
         elif hasattr(current_user, field):
             setattr(current_user, field, value)
     
     await db.commit()
     await db.refresh(current_user)
+    invalidate_user_cache(current_user.id)
     
     return current_user
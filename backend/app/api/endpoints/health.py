@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from app.db.database import get_pool_stats
+from app.utils.query_cache import query_cache
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def health():
+    return {
+        "status": "ok",
+        "database": {"pool": get_pool_stats()},
+        "query_cache": query_cache.stats(),
+    }
@@ -0,0 +1,27 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.utils.image_derivatives import ensure_derivative
+from app.utils.static_files import serve_static_file
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.api_route("/static/derived/{filename}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_image_derivative(filename: str, request: Request):
+    try:
+        path = await ensure_derivative(filename)
+    except Exception as e:
+        logger.warning("Error generating image derivative", extra={"file": filename, "error": str(e)})
+        path = None
+
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found",
+        )
+
+    return await serve_static_file(request, str(path))
@@ -1,138 +1,571 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, or_, and_
+import orjson
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any, List, Optional, Union
 from uuid import UUID
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.bulk import bulk_insert_items, validate_items
+from app.db.change_feed import change_feed, item_change
+from app.db.counters import view_counter
+from app.db.database import async_session, get_db
+from app.db.item_queries import (
+    EXPORT_COLUMNS,
+    SUMMARY_COLUMNS,
+    apply_bbox_filter,
+    apply_item_filters,
+    apply_keyset,
+    cluster_query,
+    listing_watermark_query,
+    summary_columns,
+)
 from app.models.item import Item, ItemType, CategoryEnum
 from app.models.user import User
-from app.schemas.item import ItemCreate, ItemResponse, ItemUpdate,ItemUpdateCount, FilterOptions
+from app.schemas.item import ItemCreate, ItemResponse, ItemUpdate,ItemUpdateCount, FilterOptions, ItemSort, ItemSummaryResponse, ItemView, ExportFormat
 from app.middleware.auth import get_current_user
-from app.utils.location import get_bounding_box, calculate_distance
+from app.utils.clusters import build_clusters, tile_bounds, tile_degrees, tiles_for_bbox, tiles_hull
+from app.utils.etag import content_etag, etag_matches, make_etag
+from app.utils.export import csv_chunk, csv_header, ndjson_chunk
+from app.utils.location import distances_within_radius, get_bounding_box, parse_bbox
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+from app.utils.query_cache import CacheScope, location_scope_bbox, query_cache, snap_to_grid
+from app.utils.serializers import serialize_item, serialize_item_summary
+from app.utils.spatial_index import spatial_index
+from app.utils.time_windows import TimeWindow, listing_clock, parse_time_range, resolve_time_window
+from app.utils.timing import stage
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[ItemResponse])
+def time_window(
+    now: datetime,
+    start_date: Optional[Union[datetime, date]],
+    end_date: Optional[Union[datetime, date]],
+    happening_between: Optional[str],
+    upcoming: Optional[int],
+    ongoing: bool,
+    include_expired: bool,
+) -> TimeWindow:
+    try:
+        between = parse_time_range(happening_between) if happening_between else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return resolve_time_window(now, start_date, end_date, between, upcoming, ongoing, include_expired)
+
+
+def item_views(item_id: UUID, count: Optional[int]) -> int:
+    # Persisted value plus increments not yet flushed from this worker
+    return (count or 0) + view_counter.pending(item_id)
+
+
+def item_etag(item_id: UUID, updated_at: datetime, count: Optional[int]) -> str:
+    # View counts change without touching updated_at, so they version the body too
+    return make_etag(item_id, updated_at.isoformat(), item_views(item_id, count))
+
+
+def item_detail(item: Item) -> dict:
+    # Same view count as /count and the ETag, buffered views included
+    body = serialize_item(item)
+    body["count"] = item_views(item.id, item.count)
+    return body
+
+
+@router.get("/", response_model=List[Union[ItemResponse, ItemSummaryResponse]])
 async def get_items(
     category: Optional[CategoryEnum] = None,
     type: Optional[ItemType] = None,
     search: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    lat: Optional[float] = None,
-    lng: Optional[float] = None,
-    radius: Optional[float] = 20.0,  # Default radius of 20km
+    # Date-only values are accepted as midnight UTC
+    start_date: Optional[Union[datetime, date]] = None,
+    end_date: Optional[Union[datetime, date]] = None,
+    happening_between: Optional[str] = None,
+    upcoming: Optional[int] = Query(None, ge=1, le=366),
+    ongoing: bool = False,
+    include_expired: bool = False,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: float = 20.0,  # Default radius of 20km
     created_by: Optional[str] = None,  
+    sort: Optional[ItemSort] = None,
+    limit: int = Query(settings.ITEMS_PAGE_SIZE, ge=1, le=settings.ITEMS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: ItemView = ItemView.FULL,
+    description_length: int = Query(160, ge=0, le=2000),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"GET /items/ - Params: type={type}, lat={lat}, lng={lng}, radius={radius}, created_by={created_by}")
-    
-    query = select(Item)
-    
-    if category:
-        query = query.where(Item.category == category)
-    if type:
-        query = query.where(Item.type == type)
-    if search:
-        query = query.where(
-            or_(
-                Item.title.ilike(f"%{search}%"),
-                Item.description.ilike(f"%{search}%"),
-            )
+    logger.debug("Listing items", extra={
+        "category": category, "type": type, "lat": lat, "lng": lng, "radius": radius,
+        "created_by": created_by, "sort": sort, "limit": limit, "view": view,
+    })
+
+    has_location = lat is not None and lng is not None
+    if sort is None:
+        # Searches are ranked by relevance unless another order is requested
+        sort = ItemSort.RELEVANCE if search else ItemSort.START_DATE
+    if sort == ItemSort.DISTANCE and not has_location:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sorting by distance requires lat and lng",
         )
-    if start_date:
-        query = query.where(Item.start_date >= start_date)
-    if end_date:
-        query = query.where(Item.start_date <= end_date)
+    if sort == ItemSort.RELEVANCE and not search:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sorting by relevance requires search",
+        )
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+
+    user_id = None
     if created_by:
         try:
             user_id = UUID(created_by)
-            query = query.where(Item.user_id == user_id)
         except ValueError:
-            print(f"Invalid UUID format for created_by: {created_by}")
+            logger.debug("Invalid UUID format for created_by", extra={"created_by": created_by})
             return []
-    
-    # Apply location filter if lat and lng are provided
-    if lat is not None and lng is not None:
-        try:
-            # Get bounding box for initial filtering (optimization)
-            min_lat, min_lng, max_lat, max_lng = get_bounding_box(lat, lng, radius)
-            print(f"Bounding box: min_lat={min_lat}, min_lng={min_lng}, max_lat={max_lat}, max_lng={max_lng}")
-            
-            query = query.where(
-                and_(
-                    Item.latitude >= min_lat,
-                    Item.latitude <= max_lat,
-                    Item.longitude >= min_lng,
-                    Item.longitude <= max_lng
+
+    now = listing_clock(settings.ITEMS_CLOCK_GRANULARITY_SECONDS)
+    window = time_window(now, start_date, end_date, happening_between, upcoming, ongoing, include_expired)
+
+    if has_location and settings.QUERY_CACHE_ENABLED:
+        # Nearby viewports share one cached listing centred on the grid point
+        lat = snap_to_grid(lat, settings.QUERY_CACHE_GRID_DEGREES)
+        lng = snap_to_grid(lng, settings.QUERY_CACHE_GRID_DEGREES)
+
+    filters = FilterOptions(
+        category=category,
+        type=type,
+        search_term=search,
+        start_date=window.starts_after,
+        end_date=window.starts_before,
+        ends_after=window.ends_after,
+        created_by=user_id,
+        lat=lat,
+        lng=lng,
+        radius=radius,
+    )
+    summary = view == ItemView.SUMMARY
+    # The resolved window moves with the clock, so keys and ETags roll over each step
+    key = (
+        category, type, " ".join(search.lower().split()) if search else None,
+        window, user_id, lat, lng, round(radius, 3),
+        sort, limit, cursor, view, description_length if summary else None,
+    )
+    # The spatial index knows only position and end date; any other filter needs the database
+    index_covers_filters = (
+        not (category or type or search or user_id)
+        and window.starts_after is None
+        and window.starts_before is None
+        and window.ends_after == now
+    )
+    etag = None
+
+    async def load_listing_etag():
+        with stage("watermark"):
+            max_updated_at, total, views = (await db.execute(listing_watermark_query(filters))).one()
+        return make_etag(key, max_updated_at.isoformat() if max_updated_at else None, total, views)
+
+    async def load_items():
+        body, headers = await render_items()
+        # Conditional requests already read the watermark (before the rows, so a concurrent
+        # write can only make it older); everything else is tagged by the body itself
+        headers["ETag"] = etag or content_etag(body)
+        return body, headers
+
+    async def render_items():
+        headers = {}
+
+        # Resolve radius queries from the in-process index when it is available; it holds
+        # only items that have not ended, so listings reaching into the past skip it
+        indexed_distances = None
+        if has_location and spatial_index.ready and window.ends_after is not None and window.ends_after >= now:
+            with stage("spatial_index"):
+                indexed_distances = spatial_index.query_radius(lat, lng, radius)
+            if not indexed_distances:
+                return b"[]", headers
+
+        # When the index alone decides membership and order (nearest first, no filters it
+        # cannot evaluate), page in-process and load just that page's rows
+        page_ids = None
+        if indexed_distances is not None and sort == ItemSort.DISTANCE and index_covers_filters:
+            with stage("spatial_index"):
+                page_ids, has_more = keyset_page(indexed_distances, limit, after)
+            if not page_ids:
+                return b"[]", headers
+
+        # Summary view selects only what cards and markers render
+        base_query = select(*summary_columns(description_length)) if summary else select(Item)
+
+        if page_ids is not None:
+            query = apply_item_filters(base_query, filters, page_ids)
+        else:
+            query = apply_item_filters(base_query, filters, indexed_distances)
+            query = apply_keyset(query, sort, filters, limit, after)
+
+        with stage("db"):
+            result = await db.execute(query)
+            rows = result.all()
+
+        if page_ids is not None:
+            loaded = {item.id: item for item in (rows if summary else [row[0] for row in rows])}
+            items = [loaded[item_id] for item_id in page_ids if item_id in loaded]
+            if has_more:
+                headers["X-Next-Cursor"] = encode_cursor(sort, indexed_distances[page_ids[-1]], page_ids[-1])
+        else:
+            # Fetched one row past the page; its presence means there is a next page
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            items = rows if summary else [row[0] for row in rows]
+            if has_more:
+                headers["X-Next-Cursor"] = encode_cursor(sort, rows[-1].sort_key, items[-1].id)
+
+        # Compute every distance once per request in a single vectorized pass
+        distances = None
+        filtered_out = 0
+        with stage("distance"):
+            if indexed_distances is not None:
+                distances = [indexed_distances[item.id] for item in items]
+            elif has_location:
+                keep, kept_distances = distances_within_radius(
+                    lat, lng,
+                    [item.latitude for item in items],
+                    [item.longitude for item in items],
+                    radius,
                 )
+                filtered_out = len(items) - len(keep)
+                items = [items[i] for i in keep.tolist()]
+                distances = kept_distances.tolist()
+
+        serialize = serialize_item_summary if summary else serialize_item
+        with stage("serialize"):
+            if distances is None:
+                processed_items = [serialize(item) for item in items]
+            else:
+                processed_items = [serialize(item, distance) for item, distance in zip(items, distances)]
+            body = orjson.dumps(processed_items)
+
+        logger.debug("Listed items", extra={"rows": len(rows), "returned": len(processed_items), "filtered_out": filtered_out})
+        return body, headers
+
+    cached = query_cache.get(key) if settings.QUERY_CACHE_ENABLED else None
+    if cached is None and if_none_match:
+        # Revalidate against the watermark alone before building any rows
+        etag = await load_listing_etag()
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if cached is not None:
+        body, headers = cached
+    elif settings.QUERY_CACHE_ENABLED:
+        scope = CacheScope(
+            category=category,
+            type=type,
+            created_by=user_id,
+            bbox=location_scope_bbox(lat, lng, radius) if has_location else None,
+        )
+        body, headers = await query_cache.load(key, scope, load_items)
+    else:
+        body, headers = await load_items()
+
+    # The client may hold a body tag while this entry carries a watermark tag, or vice versa
+    if etag_matches(if_none_match, headers["ETag"]) or etag_matches(if_none_match, content_etag(body)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": headers["ETag"]})
+
+    # Body is already rendered JSON, so skip response_model re-validation
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+async def export_items(
+    format: ExportFormat = ExportFormat.NDJSON,
+    category: Optional[CategoryEnum] = None,
+    type: Optional[ItemType] = None,
+    search: Optional[str] = None,
+    start_date: Optional[Union[datetime, date]] = None,
+    end_date: Optional[Union[datetime, date]] = None,
+    happening_between: Optional[str] = None,
+    upcoming: Optional[int] = Query(None, ge=1, le=366),
+    ongoing: bool = False,
+    include_expired: bool = False,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: float = 20.0,
+    created_by: Optional[UUID] = None,
+):
+    # Everything that can reject the request runs here: once the stream has started an
+    # error can only cut the body short
+    has_location = lat is not None and lng is not None
+    now = listing_clock(settings.ITEMS_CLOCK_GRANULARITY_SECONDS)
+    window = time_window(now, start_date, end_date, happening_between, upcoming, ongoing, include_expired)
+    filters = FilterOptions(
+        category=category,
+        type=type,
+        search_term=search,
+        start_date=window.starts_after,
+        end_date=window.starts_before,
+        ends_after=window.ends_after,
+        created_by=created_by,
+        lat=lat,
+        lng=lng,
+        radius=radius,
+    )
+    query = apply_item_filters(select(*EXPORT_COLUMNS), filters)
+    render = csv_chunk if format == ExportFormat.CSV else ndjson_chunk
+
+    async def generate_rows():
+        if format == ExportFormat.CSV:
+            yield csv_header(with_distance=has_location)
+
+        # The session lives as long as the stream, not the request handler
+        async with async_session() as session:
+            result = await session.stream(
+                query.execution_options(yield_per=settings.ITEMS_EXPORT_BATCH_SIZE)
             )
-        except Exception as e:
-            print(f"Error calculating bounding box: {e}")
-            pass
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
-    print(f"Query returned {len(items)} items before distance filtering")
+            # Each partition is one server-side cursor fetch; the next is not read until
+            # the client has taken this one
+            async for rows in result.partitions():
+                distances = None
+                if has_location:
+                    keep, kept_distances = distances_within_radius(
+                        lat, lng,
+                        [row.latitude for row in rows],
+                        [row.longitude for row in rows],
+                        radius,
+                    )
+                    rows = [rows[i] for i in keep.tolist()]
+                    distances = kept_distances.tolist()
+                if rows:
+                    yield render(rows, distances)
 
-    processed_items = []
-    filtered_out = 0
-    
-    for item in items:
-        if lat is not None and lng is not None:
-            try:
-                distance = calculate_distance(lat, lng, item.latitude, item.longitude)
-                # Only include items within the specified radius
-                if distance > radius:
-                    filtered_out += 1
+    extension = format.value
+    return StreamingResponse(
+        generate_rows(),
+        media_type="text/csv" if format == ExportFormat.CSV else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="items.{extension}"'},
+    )
+
+
+@router.get("/changes")
+async def item_changes(
+    request: Request,
+    bbox: Optional[str] = None,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius: float = 20.0,
+    category: Optional[CategoryEnum] = None,
+    type: Optional[ItemType] = None,
+    created_by: Optional[UUID] = None,
+):
+    """
+    Server-sent events for items created, updated or deleted inside a viewport
+    (bbox=minLng,minLat,maxLng,maxLat) or radius (lat, lng, radius), narrowed by the
+    usual filters. A `resync` event means changes were missed and the client should reload.
+    """
+    area = None
+    center = None
+    if bbox:
+        try:
+            area = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    elif lat is not None and lng is not None:
+        center = (lat, lng)
+        area = get_bounding_box(lat, lng, radius)
+
+    subscription = change_feed.subscribe(
+        category=category,
+        type=type,
+        created_by=created_by,
+        bbox=area,
+        center=center,
+        radius_km=radius if center else None,
+    )
+
+    async def stream_events():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                if subscription.overflowed:
+                    yield b"event: resync\ndata: {}\n\n"
+                    return
+                try:
+                    frame = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # Comment line keeps proxies from closing an idle stream
+                    yield b": keepalive\n\n"
                     continue
-            except Exception as e:
-                print(f"Error calculating distance for item {item.id}: {e}")
-                pass
-                
-        item_dict = {
-            "id": str(item.id),
-            "type": item.type.value,
-            "title": item.title,
-            "description": item.description,
-            "category": item.category.value,
-            "startDate": item.start_date.isoformat(),
-            "endDate": item.end_date.isoformat(),
-            "address": item.address,
-            "location": {
-                "lat": item.latitude,
-                "lng": item.longitude
-            },
-            "image": item.image,
-            "createdBy": str(item.user_id),
-            "createdAt": item.created_at.isoformat(),
-            "updatedAt": item.updated_at.isoformat(),
-             "count": item.count
-        }
-        
-        if lat is not None and lng is not None:
-            try:
-                item_dict["distance"] = round(calculate_distance(lat, lng, item.latitude, item.longitude), 1)
-            except Exception as e:
-                print(f"Error adding distance to item {item.id}: {e}")
-                item_dict["distance"] = -1  # Use -1 to indicate unknown distance
-            
-        processed_items.append(item_dict)
-    
-    print(f"Returning {len(processed_items)} items after filtering (filtered out {filtered_out} items)")
-    return processed_items
+                yield frame
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/clusters")
+async def get_item_clusters(
+    bbox: str,
+    zoom: int = Query(..., ge=0, le=22),
+    category: Optional[CategoryEnum] = None,
+    type: Optional[ItemType] = None,
+    search: Optional[str] = None,
+    start_date: Optional[Union[datetime, date]] = None,
+    end_date: Optional[Union[datetime, date]] = None,
+    happening_between: Optional[str] = None,
+    upcoming: Optional[int] = Query(None, ge=1, le=366),
+    ongoing: bool = False,
+    include_expired: bool = False,
+    created_by: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Items in a map viewport (bbox=minLng,minLat,maxLng,maxLat) grouped into grid clusters
+    with a count, centroid and per-category breakdown; from CLUSTER_DETAIL_ZOOM up, the
+    items themselves. Results are built and cached per map tile, so every tile the bbox
+    touches is returned whole.
+    """
+    try:
+        area = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    tiles = tiles_for_bbox(area, zoom)
+    if len(tiles) > settings.CLUSTER_MAX_TILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox spans too many tiles at this zoom",
+        )
+
+    now = listing_clock(settings.ITEMS_CLOCK_GRANULARITY_SECONDS)
+    window = time_window(now, start_date, end_date, happening_between, upcoming, ongoing, include_expired)
+    filters = FilterOptions(
+        category=category,
+        type=type,
+        search_term=search,
+        start_date=window.starts_after,
+        end_date=window.starts_before,
+        ends_after=window.ends_after,
+        created_by=created_by,
+    )
+    filter_key = (
+        category, type, " ".join(search.lower().split()) if search else None,
+        window, created_by,
+    )
+    size = tile_degrees(zoom)
+    cell_degrees = size / settings.CLUSTER_CELLS_PER_TILE
+
+    async def load_tiles(mode: str, loader):
+        # Serve what the cache holds and fetch the remaining tiles in one query
+        found = {}
+        missing = []
+        for tile in tiles:
+            cached = query_cache.get(("clusters", mode, filter_key, zoom, tile)) if settings.QUERY_CACHE_ENABLED else None
+            if cached is None:
+                missing.append(tile)
+            else:
+                found[tile] = cached
+
+        if missing:
+            generation = query_cache.generation
+            loaded = await loader(missing)
+            if loaded is None:
+                return None
+            for tile in missing:
+                found[tile] = loaded.get(tile, [])
+                if settings.QUERY_CACHE_ENABLED:
+                    scope = CacheScope(category=category, type=type, created_by=created_by, bbox=tile_bounds(tile, zoom))
+                    query_cache.set(("clusters", mode, filter_key, zoom, tile), scope, found[tile], generation)
+
+        return [entry for tile in tiles for entry in found[tile]]
+
+    async def load_item_tiles(missing):
+        # A cell of margin catches items whose float position rounds across a tile edge
+        query = apply_item_filters(select(*SUMMARY_COLUMNS), filters)
+        query = apply_bbox_filter(query, tiles_hull(missing, zoom, cell_degrees))
+        with stage("db"):
+            rows = (await db.execute(query.limit(settings.CLUSTER_MAX_ITEMS + 1))).all()
+        if len(rows) > settings.CLUSTER_MAX_ITEMS:
+            return None
+        loaded = defaultdict(list)
+        for row in rows:
+            tile = (math.floor(row.latitude / size), math.floor(row.longitude / size))
+            loaded[tile].append(serialize_item_summary(row))
+        return loaded
+
+    async def load_cluster_tiles(missing):
+        query = cluster_query(filters, tiles_hull(missing, zoom, cell_degrees), cell_degrees)
+        with stage("db"):
+            rows = (await db.execute(query)).all()
+        return build_clusters(rows, cell_degrees, settings.CLUSTER_CELLS_PER_TILE)
+
+    items = None
+    if zoom >= settings.CLUSTER_DETAIL_ZOOM:
+        # Too many items to send one by one falls back to clusters
+        items = await load_tiles("items", load_item_tiles)
+    clusters = await load_tiles("clusters", load_cluster_tiles) if items is None else []
+
+    with stage("serialize"):
+        return ORJSONResponse({
+            "zoom": zoom,
+            "cellDegrees": cell_degrees,
+            "clusters": clusters,
+            "items": items or [],
+        })
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_item(
     item_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
-    query = await db.execute(select(Item).where(Item.id == item_id))
-    item = query.scalar_one_or_none()
+    if if_none_match:
+        # Revalidate from the version columns alone before loading the row
+        with stage("db"):
+            query = await db.execute(select(Item.updated_at, Item.count).where(Item.id == item_id))
+            version = query.one_or_none()
+        if version is not None:
+            etag = item_etag(item_id, version.updated_at, version.count)
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    with stage("db"):
+        query = await db.execute(select(Item).where(Item.id == item_id))
+        item = query.scalar_one_or_none()
     
     if not item:
         raise HTTPException(
@@ -140,27 +573,11 @@ async def get_item(
             detail="Item not found",
         )
     
-    item_dict = {
-        "id": str(item.id),
-        "type": item.type.value,
-        "title": item.title,
-        "description": item.description,
-        "category": item.category.value,
-        "startDate": item.start_date.isoformat(),
-        "endDate": item.end_date.isoformat(),
-        "address": item.address,
-        "location": {
-            "lat": item.latitude,
-            "lng": item.longitude
-        },
-        "image": item.image,
-        "createdBy": str(item.user_id),
-        "createdAt": item.created_at.isoformat(),
-        "updatedAt": item.updated_at.isoformat(),
-        "count": item.count
-    }
-    
-    return item_dict
+    with stage("serialize"):
+        return ORJSONResponse(
+            item_detail(item),
+            headers={"ETag": item_etag(item.id, item.updated_at, item.count)},
+        )
 
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
@@ -187,28 +604,46 @@ async def create_item(
     db.add(new_item)
     await db.commit()
     await db.refresh(new_item)
+    await change_feed.publish([item_change("create", new_item)])
     
-    item_dict = {
-        "id": str(new_item.id),
-        "type": new_item.type.value,
-        "title": new_item.title,
-        "description": new_item.description,
-        "category": new_item.category.value,
-        "startDate": new_item.start_date.isoformat(),
-        "endDate": new_item.end_date.isoformat(),
-        "address": new_item.address,
-        "location": {
-            "lat": new_item.latitude,
-            "lng": new_item.longitude
+    return ORJSONResponse(serialize_item(new_item), status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/bulk")
+async def bulk_create_items(
+    records: List[Any] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if len(records) > settings.ITEMS_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.ITEMS_BULK_MAX} items per request",
+        )
+
+    # Rows are validated individually so one bad record does not reject the batch
+    with stage("validate"):
+        rows, errors = validate_items(records, current_user.id)
+    with stage("db"):
+        result = await bulk_insert_items(db, rows)
+        await db.commit()
+
+    values_by_index = dict(rows)
+    await change_feed.publish([
+        item_change("create", SimpleNamespace(id=item_id, **values_by_index[index]), include_item=False)
+        for index, item_id in result.created
+    ])
+
+    errors = sorted(errors + result.errors, key=lambda error: error["index"])
+    return ORJSONResponse(
+        {
+            "created": len(result.created),
+            "failed": len(errors),
+            "items": [{"index": index, "id": str(item_id)} for index, item_id in result.created],
+            "errors": errors,
         },
-        "image": new_item.image,
-        "createdBy": str(new_item.user_id),
-        "createdAt": new_item.created_at.isoformat(),
-        "updatedAt": new_item.updated_at.isoformat(),
-         "count": new_item.count
-    }
-    
-    return item_dict
+        status_code=status.HTTP_201_CREATED if result.created else status.HTTP_422_UNPROCESSABLE_ENTITY,
+    )
 
 
 @router.patch("/{item_id}", response_model=ItemResponse)
@@ -233,38 +668,22 @@ async def update_item(
             detail="Not authorized to update this item",
         )
 
+    # Listings and subscribers that held the item before the edit must hear about it too
+    previous = (item.category, item.type, item.user_id, item.latitude, item.longitude)
+
     item_data = item_update.dict(exclude_unset=True)
     for field, value in item_data.items():
         if field == "location" and value:
-            setattr(item, "latitude", value.lat)
-            setattr(item, "longitude", value.lng)
+            setattr(item, "latitude", value["lat"])
+            setattr(item, "longitude", value["lng"])
         elif hasattr(item, field) and value is not None:
             setattr(item, field, value)
     
     await db.commit()
     await db.refresh(item)
+    await change_feed.publish([item_change("update", item, previous)])
 
-    item_dict = {
-        "id": str(item.id),
-        "type": item.type.value,
-        "title": item.title,
-        "description": item.description,
-        "category": item.category.value,
-        "startDate": item.start_date.isoformat(),
-        "endDate": item.end_date.isoformat(),
-        "address": item.address,
-        "location": {
-            "lat": item.latitude,
-            "lng": item.longitude
-        },
-        "image": item.image,
-        "createdBy": str(item.user_id),
-        "createdAt": item.created_at.isoformat(),
-        "updatedAt": item.updated_at.isoformat(),
-        "count": item.count
-    }
-    
-    return item_dict
+    return ORJSONResponse(serialize_item(item))
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -290,6 +709,7 @@ async def delete_item(
 
     await db.delete(item)
     await db.commit()
+    await change_feed.publish([item_change("delete", item)])
 
 @router.patch("/{item_id}/count", response_model=ItemResponse)
 async def update_item_count(
@@ -306,16 +726,10 @@ async def update_item_count(
             detail="Item not found",
         )
 
-    # You might want to add authorization checks here to ensure
-    # only authorized users can update the count. For example:
-   
-
-    item.count += 1 # Increment the count by 1
-    await db.commit()
-    await db.refresh(item)
+    # Buffered and flushed in batches; no row lock or write round trip per view
+    view_counter.increment(item.id)
 
-    # Construct the response dictionary using the from_orm method
-    return ItemResponse.from_orm(item)
+    return ORJSONResponse(item_detail(item))
 
 @router.get("/{item_id}/count")
 async def get_item_count(
@@ -331,4 +745,4 @@ async def get_item_count(
             detail="Item not found",
         )
 
-    return {"count": count}
+    return {"count": item_views(item_id, count)}
@@ -0,0 +1,51 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.change_feed import change_feed
+from app.db.counters import view_counter
+from app.db.database import get_pool_stats
+from app.utils.metrics import GaugeCollector, registry
+from app.utils.query_cache import query_cache
+from app.utils.spatial_index import spatial_index
+
+router = APIRouter()
+
+# Starlette appends the charset
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _pool_gauges():
+    stats = get_pool_stats()
+    for key in ("size", "checked_out", "checked_in", "overflow", "waiting"):
+        yield (key,), stats[key]
+
+
+def _query_cache_gauges():
+    stats = query_cache.stats()
+    for key in ("entries", "hits", "misses", "coalesced", "evictions", "invalidations"):
+        yield (key,), stats[key]
+
+
+registry.register(GaugeCollector(
+    "db_pool_connections", "Connection pool state by kind.", ("state",), _pool_gauges,
+))
+registry.register(GaugeCollector(
+    "query_cache", "Listing cache entries and lifetime counters by kind.", ("stat",), _query_cache_gauges,
+))
+registry.register(GaugeCollector(
+    "change_feed_subscribers", "Open item change feed streams.", (),
+    lambda: [((), len(change_feed.subscriptions))],
+))
+registry.register(GaugeCollector(
+    "view_counts_pending", "Item views buffered and not yet flushed.", (),
+    lambda: [((), view_counter.pending_total)],
+))
+registry.register(GaugeCollector(
+    "spatial_index_items", "Items held by the in-process spatial index.", (),
+    lambda: [((), len(spatial_index))],
+))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
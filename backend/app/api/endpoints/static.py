@@ -0,0 +1,24 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.utils.image_handler import APP_DIR
+from app.utils.static_files import serve_static_file
+
+STATIC_DIR = os.path.realpath(APP_DIR / "static")
+
+router = APIRouter()
+
+
+@router.api_route("/static/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_static_file(file_path: str, request: Request):
+    full_path = os.path.realpath(os.path.join(STATIC_DIR, file_path))
+    # Stay inside the static directory and never expose in-progress (dot-prefixed) files
+    hidden = any(part.startswith(".") for part in file_path.split("/"))
+    if hidden or not full_path.startswith(STATIC_DIR + os.sep):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+    return await serve_static_file(request, full_path)
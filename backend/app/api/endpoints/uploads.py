@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from typing import Optional
-import os
-import shutil
 from app.models.user import User
 from app.middleware.auth import get_current_user
-from app.utils.image_handler import save_upload_file
+from app.utils.image_derivatives import schedule_derivatives
+from app.utils.image_handler import UploadTooLarge, save_upload_file
+from app.utils.timing import stage
 
 router = APIRouter()
 
@@ -19,9 +18,18 @@ async def upload_image(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be an image",
         )
-    
-    file_path = await save_upload_file(file)
-    
+
+    try:
+        with stage("write"):
+            file_path = await save_upload_file(file)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large",
+        )
+
+    schedule_derivatives(file_path)
+
     return {"url": file_path}
 
 
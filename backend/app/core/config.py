@@ -9,14 +9,93 @@ class Settings(BaseSettings):
     APP_DESCRIPTION: str
     DEBUG: bool
 
+    # Structured logs on stderr: "json" lines, or "text" for local development
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    # Per-request stage timings (Server-Timing header) and Prometheus /metrics
+    SERVER_TIMING_ENABLED: bool = True
+    METRICS_ENABLED: bool = True
+
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Statements slower than this are logged with their parameters
+    DB_SLOW_QUERY_MS: float = 200.0
+    # One statement repeated this often within a request is reported as a likely N+1
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+    # Per-request X-DB-Queries / X-DB-Time-Ms / X-DB-N-Plus-One headers (always on with DEBUG)
+    DB_QUERY_HEADERS: bool = False
 
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
 
     CORS_ORIGINS: List[str]
 
+    # Item listing page size (keyset pagination)
+    ITEMS_PAGE_SIZE: int = 100
+    ITEMS_MAX_PAGE_SIZE: int = 500
+    # "Now" for upcoming/ongoing/expired filters is floored to this step, so cache keys
+    # and ETags stay stable within it
+    ITEMS_CLOCK_GRANULARITY_SECONDS: int = 60
+    # `python start.py --check-plans` fails plans that sequentially scan tables larger than this
+    PLAN_CHECK_MAX_SEQ_SCAN_ROWS: int = 10000
+    # Largest batch accepted by POST /api/items/bulk
+    ITEMS_BULK_MAX: int = 10000
+    # Largest request body accepted by POST /api/items/bulk, checked before it is parsed
+    ITEMS_BULK_MAX_BYTES: int = 20 * 1024 * 1024
+    # Rows fetched per server-side cursor round trip by GET /api/items/export
+    ITEMS_EXPORT_BATCH_SIZE: int = 1000
+
+    # Seconds between flushes of buffered item view counts
+    VIEW_COUNT_FLUSH_SECONDS: float = 5.0
+
+    # In-process spatial index of active items (per worker)
+    SPATIAL_INDEX_ENABLED: bool = False
+    SPATIAL_INDEX_CELL_DEGREES: float = 0.05
+
+    # Cache of rendered item listings (per worker)
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL_SECONDS: float = 30.0
+    QUERY_CACHE_GRID_DEGREES: float = 0.001
+
+    # Map clustering for GET /api/items/clusters
+    CLUSTER_CELLS_PER_TILE: int = 8
+    CLUSTER_DETAIL_ZOOM: int = 15
+    CLUSTER_MAX_TILES: int = 64
+    CLUSTER_MAX_ITEMS: int = 2000
+
+    # Real-time item change feed (SSE), shared across workers with LISTEN/NOTIFY
+    CHANGE_FEED_ENABLED: bool = True
+    CHANGE_FEED_CHANNEL: str = "item_changes"
+    CHANGE_FEED_QUEUE_SIZE: int = 256
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0
+    CHANGE_FEED_CELL_DEGREES: float = 0.1
+
+    # Image uploads
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 256 * 1024
+
+    # Resized image variants, rendered in a process pool
+    IMAGE_DERIVATIVE_WIDTHS: List[int] = [320, 640, 1280]
+    IMAGE_QUALITY: int = 80
+    IMAGE_WORKERS: int = 2
+
+    # Stat/validator cache for files under /static
+    STATIC_FILE_CACHE_MAX_ENTRIES: int = 4096
+    STATIC_FILE_CACHE_TTL_SECONDS: float = 10.0
+
     @field_validator("CORS_ORIGINS", mode="before")
     def assemble_cors_origins(cls, v: str | List[str]) -> List[str]:
         if isinstance(v, str) and not v.startswith("["):
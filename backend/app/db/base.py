@@ -1,3 +1 @@
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+from app.db.database import Base
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import Item
+from app.schemas.item import ItemCreate
+from app.utils.geohash import encode as geohash_encode
+from app.utils.time_windows import as_utc
+
+# Rows per INSERT ... VALUES ... RETURNING statement
+BULK_INSERT_BATCH_SIZE = 1000
+
+
+class BulkInsertResult(NamedTuple):
+    # (input index, new item id) for every inserted row
+    created: List[Tuple[int, UUID]]
+    # {"index": ..., "errors": [...]} for every rejected row
+    errors: List[Dict[str, Any]]
+
+
+def item_values(item_in: ItemCreate, user_id: UUID) -> Dict[str, Any]:
+    """
+    Column values for a new item, as create_item would set them. Dates are made
+    timezone-aware, since these values are also published to the change feed.
+    """
+    return {
+        "type": item_in.type,
+        "title": item_in.title,
+        "description": item_in.description,
+        "category": item_in.category,
+        "start_date": as_utc(item_in.start_date),
+        "end_date": as_utc(item_in.end_date),
+        "address": item_in.address,
+        "latitude": item_in.location.lat,
+        "longitude": item_in.location.lng,
+        "image": item_in.image,
+        "user_id": user_id,
+        "count": 0,
+    }
+
+
+def validate_items(records: Sequence[Any], user_id: UUID) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Validate raw records as ItemCreate one by one, so a bad row is reported without
+    rejecting the rest. Returns (index, column values) pairs and per-row errors.
+    """
+    rows = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            item_in = ItemCreate.model_validate(record)
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "errors": [
+                    {"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]}
+                    for error in e.errors()
+                ],
+            })
+            continue
+        rows.append((index, item_values(item_in, user_id)))
+    return rows, errors
+
+
+async def _insert_returning_ids(session: AsyncSession, values: List[Dict[str, Any]]) -> List[UUID]:
+    # Bulk INSERTs skip mapper events, so fill in what _sync_geohash would have set
+    for row in values:
+        row["geohash"] = geohash_encode(row["latitude"], row["longitude"])
+    result = await session.execute(insert(Item).returning(Item.id, sort_by_parameter_order=True), values)
+    return list(result.scalars())
+
+
+async def bulk_insert_items(session: AsyncSession, rows: Sequence[Tuple[int, Dict[str, Any]]]) -> BulkInsertResult:
+    """
+    Insert items as batched multi-row INSERT ... RETURNING statements.
+    A batch the database rejects is retried row by row, so only the offending rows fail.
+    The caller commits.
+    """
+    created = []
+    errors = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        batch = rows[start:start + BULK_INSERT_BATCH_SIZE]
+        try:
+            async with session.begin_nested():
+                ids = await _insert_returning_ids(session, [dict(values) for _, values in batch])
+            created.extend(zip((index for index, _ in batch), ids))
+            continue
+        except DBAPIError:
+            pass
+
+        for index, values in batch:
+            try:
+                async with session.begin_nested():
+                    ids = await _insert_returning_ids(session, [dict(values)])
+                created.append((index, ids[0]))
+            except DBAPIError as e:
+                errors.append({
+                    "index": index,
+                    "errors": [{"loc": [], "msg": str(e.orig), "type": "database_error"}],
+                })
+    return BulkInsertResult(created=created, errors=errors)
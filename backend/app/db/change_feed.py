@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import asyncpg
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.database import async_session, engine
+from app.models.item import CategoryEnum, ItemType
+from app.utils.query_cache import query_cache
+from app.utils.serializers import serialize_item_summary
+from app.utils.spatial_index import spatial_index
+from app.utils.subscriptions import Subscription, SubscriptionIndex
+from app.utils.time_windows import as_utc
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7900
+
+# Past this many changes at once, clearing the listing cache beats scoped invalidation
+CACHE_CLEAR_THRESHOLD = 50
+
+RECONNECT_DELAY_SECONDS = 2.0
+
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+
+
+def item_change(op: str, item: Any, previous: Optional[Tuple] = None, include_item: bool = True) -> Dict[str, Any]:
+    """
+    Describe a committed create, update or delete of an item.
+    `previous` is the (category, type, user_id, latitude, longitude) the item had before an update.
+    """
+    if previous is not None:
+        category, type, user_id, lat, lng = previous
+        # asyncpg returns its own UUID type, which orjson cannot encode
+        previous = (category, type, UUID(str(user_id)), lat, lng)
+    return {
+        "op": op,
+        "id": UUID(str(item.id)),
+        "category": item.category,
+        "type": item.type,
+        "user_id": UUID(str(item.user_id)),
+        "lat": item.latitude,
+        "lng": item.longitude,
+        # The spatial index compares this with an aware "now"
+        "end_date": as_utc(item.end_date),
+        "previous": previous,
+        # Subscribers get the summary shape; deletes and bulk loads send the id only
+        "item": serialize_item_summary(item) if include_item and op != "delete" else None,
+    }
+
+
+def _decode_change(change: Dict[str, Any]) -> Dict[str, Any]:
+    # Restore native types after a trip through NOTIFY
+    previous = change.get("previous")
+    if previous is not None:
+        category, type, user_id, lat, lng = previous
+        previous = (CategoryEnum(category), ItemType(type), UUID(user_id), lat, lng)
+    return {
+        **change,
+        "id": UUID(change["id"]),
+        "category": CategoryEnum(change["category"]),
+        "type": ItemType(change["type"]),
+        "user_id": UUID(change["user_id"]),
+        "end_date": datetime.fromisoformat(change["end_date"]) if change.get("end_date") else None,
+        "previous": previous,
+    }
+
+
+def _event_frame(change: Dict[str, Any]) -> bytes:
+    data = orjson.dumps({"id": change["id"], "item": change["item"]})
+    return b"event: " + change["op"].encode() + b"\ndata: " + data + b"\n\n"
+
+
+class ChangeFeed:
+    """
+    Fans item changes out to this worker's SSE subscribers and, through Postgres
+    LISTEN/NOTIFY, to every other worker, which also refresh their spatial index and
+    listing cache from the same messages.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self.subscriptions = SubscriptionIndex(cell_degrees=settings.CHANGE_FEED_CELL_DEGREES)
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        # Resyncs started from notification callbacks, kept referenced until they finish
+        self._resyncs: Set[asyncio.Task] = set()
+
+    def subscribe(self, **filters) -> Subscription:
+        subscription = Subscription(queue_size=settings.CHANGE_FEED_QUEUE_SIZE, **filters)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.remove(subscription)
+
+    def apply(self, changes: List[Dict[str, Any]]):
+        """
+        Bring this worker's in-memory state up to date and notify matching subscribers.
+        """
+        scoped = len(changes) <= CACHE_CLEAR_THRESHOLD
+        if not scoped:
+            query_cache.clear()
+
+        for change in changes:
+            current = (change["category"], change["type"], change["user_id"], change["lat"], change["lng"])
+            previous = change["previous"]
+
+            if change["op"] == "delete":
+                spatial_index.remove(change["id"])
+            else:
+                spatial_index.upsert(change["id"], change["lat"], change["lng"], change["end_date"])
+
+            if scoped:
+                if previous is not None:
+                    query_cache.invalidate_item(*previous)
+                query_cache.invalidate_item(*current)
+
+            # Subscribers whose area held the item before or after the change
+            points = [(change["lat"], change["lng"])]
+            if previous is not None:
+                points.append((previous[3], previous[4]))
+            candidates = self.subscriptions.candidates(points)
+            if not candidates:
+                continue
+
+            frame = _event_frame(change)
+            for subscription in candidates:
+                if subscription.matches(*current) or (previous is not None and subscription.matches(*previous)):
+                    subscription.deliver(frame)
+
+    async def publish(self, changes: List[Dict[str, Any]]):
+        """
+        Apply committed changes locally, then broadcast them to the other workers.
+        """
+        if not changes:
+            return
+        self.apply(changes)
+        await self._notify(self._payloads(changes))
+
+    async def publish_resync(self):
+        """
+        Tell every worker to drop its derived state and rebuild it from the database, e.g.
+        after a bulk import from outside the app, where replaying every row would not pay.
+        """
+        await self._resync()
+        payload = orjson.dumps({"origin": self.origin, "resync": True}).decode()
+        await self._notify([payload])
+
+    async def _notify(self, payloads: List[str]):
+        if not settings.CHANGE_FEED_ENABLED:
+            return
+        try:
+            async with engine.begin() as connection:
+                for payload in payloads:
+                    await connection.execute(select(func.pg_notify(self.channel, payload)))
+        except Exception as e:
+            # Other workers fall back to their cache TTL
+            logger.warning("Error publishing item changes", extra={"payloads": len(payloads), "error": str(e)})
+
+    def _payloads(self, changes: List[Dict[str, Any]]) -> List[str]:
+        """
+        Pack encoded changes into as few NOTIFY payloads as fit under the size limit.
+        """
+        prefix = b'{"origin":"' + self.origin.encode() + b'","changes":['
+        payloads = []
+        batch: List[bytes] = []
+        size = len(prefix) + 2
+        for change in changes:
+            encoded = orjson.dumps(change)
+            if len(prefix) + len(encoded) + 2 > MAX_NOTIFY_BYTES:
+                # Too large with the item attached; receivers send the id only
+                encoded = orjson.dumps({**change, "item": None})
+            if batch and size + len(encoded) + 1 > MAX_NOTIFY_BYTES:
+                payloads.append(prefix + b",".join(batch) + b"]}")
+                batch, size = [], len(prefix) + 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            payloads.append(prefix + b",".join(batch) + b"]}")
+        return [payload.decode() for payload in payloads]
+
+    def _on_notification(self, connection, pid, channel, payload: str):
+        try:
+            message = orjson.loads(payload)
+            if message["origin"] == self.origin:
+                return
+            if message.get("resync"):
+                task = asyncio.create_task(self._resync())
+                self._resyncs.add(task)
+                task.add_done_callback(self._resyncs.discard)
+                return
+            self.apply([_decode_change(change) for change in message["changes"]])
+        except Exception as e:
+            logger.warning("Error applying item change notification", extra={"error": str(e)})
+
+    async def _resync(self):
+        # Notifications sent while disconnected are lost; drop derived state and tell clients
+        query_cache.clear()
+        for subscription in self.subscriptions:
+            subscription.deliver(RESYNC_FRAME)
+        if spatial_index.ready:
+            async with async_session() as session:
+                await spatial_index.rebuild(session)
+
+    async def _listen(self):
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        reconnecting = False
+        while True:
+            try:
+                self._connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                self._connection.add_termination_listener(lambda _: closed.set())
+                await self._connection.add_listener(self.channel, self._on_notification)
+                if reconnecting:
+                    await self._resync()
+                await closed.wait()
+                logger.warning("Change feed listener disconnected, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Change feed listener error", extra={"error": str(e)})
+            reconnecting = True
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def start(self):
+        if settings.CHANGE_FEED_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+
+change_feed = ChangeFeed(channel=settings.CHANGE_FEED_CHANNEL)
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Integer, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.models.item import Item
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE ... FROM (VALUES ...) statement
+FLUSH_BATCH_SIZE = 500
+
+
+class ViewCounter:
+    """
+    Write-behind view counter.
+    Increments are aggregated in memory per worker and flushed periodically as
+    one UPDATE ... FROM (VALUES ...) per batch, so page views never lock the item row.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Dict[UUID, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, item_id: UUID, amount: int = 1):
+        self._pending[item_id] = self._pending.get(item_id, 0) + amount
+
+    def pending(self, item_id: UUID) -> int:
+        return self._pending.get(item_id, 0)
+
+    @property
+    def pending_total(self) -> int:
+        return sum(self._pending.values())
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        # Swap the buffer first so increments arriving during the flush are kept
+        deltas, self._pending = self._pending, {}
+        rows = list(deltas.items())
+        try:
+            async with async_session() as session:
+                for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+                    batch = values(
+                        column("id", PG_UUID(as_uuid=True)),
+                        column("delta", Integer),
+                        name="deltas",
+                    ).data(rows[start:start + FLUSH_BATCH_SIZE])
+                    await session.execute(
+                        update(Item)
+                        .where(Item.id == batch.c.id)
+                        # Views are not content edits, so leave updated_at untouched
+                        .values(count=func.coalesce(Item.count, 0) + batch.c.delta, updated_at=Item.updated_at)
+                    )
+                await session.commit()
+        except Exception as e:
+            logger.warning("Error flushing view counts, will retry", extra={"items": len(deltas), "error": str(e)})
+            for item_id, delta in deltas.items():
+                self.increment(item_id, delta)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+view_counter = ViewCounter(flush_interval=settings.VIEW_COUNT_FLUSH_SECONDS)
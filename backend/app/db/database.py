@@ -1,15 +1,107 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.db.query_stats import instrument_engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    poolclass=NullPool,
-)
+
+class PoolStats:
+    """
+    Live counters for the connection pool, updated from pool hooks.
+    """
+
+    def __init__(self):
+        self.waiting = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.connect_count = 0
+        self.connect_time_total = 0.0
+        self.last_connect_time = 0.0
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how many callers are blocked waiting for a connection.
+    """
+
+    # Log under SQLAlchemy's own pool logger rather than this module's "app." namespace
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+    def _do_get(self):
+        # A caller blocks only when the pool is drained and overflow is exhausted
+        blocking = self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+        if not blocking:
+            return super()._do_get()
+
+        pool_stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.waiting -= 1
+            pool_stats.wait_count += 1
+            pool_stats.wait_time_total += time.perf_counter() - started
+
+
+def create_engine_from_settings() -> AsyncEngine:
+    """
+    Build the application's single async engine from Settings.
+    """
+    new_engine = create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DB_ECHO,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy's asyncpg adapter cache and asyncpg's own statement cache
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+    @event.listens_for(new_engine.sync_engine, "do_connect")
+    def _timed_connect(dialect, conn_rec, cargs, cparams):
+        started = time.perf_counter()
+        connection = dialect.connect(*cargs, **cparams)
+        elapsed = time.perf_counter() - started
+        pool_stats.connect_count += 1
+        pool_stats.connect_time_total += elapsed
+        pool_stats.last_connect_time = elapsed
+        return connection
+
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+def get_pool_stats() -> dict:
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "waiting": pool_stats.waiting,
+        "wait_count": pool_stats.wait_count,
+        "avg_wait_ms": round(pool_stats.wait_time_total / pool_stats.wait_count * 1000, 2) if pool_stats.wait_count else 0.0,
+        "connect_count": pool_stats.connect_count,
+        "avg_connect_ms": round(pool_stats.connect_time_total / pool_stats.connect_count * 1000, 2) if pool_stats.connect_count else 0.0,
+        "last_connect_ms": round(pool_stats.last_connect_time * 1000, 2),
+    }
+
+
+engine = create_engine_from_settings()
 
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
@@ -3,10 +3,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime, timezone, timedelta
 
+from app.db.bulk import bulk_insert_items
 from app.db.database import Base, engine, async_session
 from app.core.security import get_password_hash
 from app.models.user import User
-from app.models.item import Item, ItemType, CategoryEnum
+from app.models.item import ItemType, CategoryEnum
 
 
 async def init_db():
@@ -71,7 +72,7 @@ async def init_db():
             # Sample items
             sample_items = [
                 # EVENTS - Community Meetup
-                Item(
+                dict(
                     type=ItemType.EVENT,
                     title="Neighborhood Community Meetup",
                     description="Join us for a neighborhood community meetup at the local park. Meet your neighbors and discuss local issues.",
@@ -86,7 +87,7 @@ async def init_db():
                     count=0,
                 ),
                 # EVENTS - Workshop
-                Item(
+                dict(
                     type=ItemType.EVENT,
                     title="Tech Workshop",
                     description="Hands-on workshop on web development. Learn to build your first website!",
@@ -101,7 +102,7 @@ async def init_db():
                     count=0,
                 ),
                 # EVENTS - Food
-                Item(
+                dict(
                     type=ItemType.EVENT,
                     title="Food Festival",
                     description="Sample cuisines from around the world at our annual food festival.",
@@ -116,7 +117,7 @@ async def init_db():
                     count=0,
                 ),
                 # EVENTS - Sale
-                Item(
+                dict(
                     type=ItemType.EVENT,
                     title="Weekend Market Sale",
                     description="Local vendors selling handmade goods, vintage items, and more at discounted prices.",
@@ -131,7 +132,7 @@ async def init_db():
                     count=0,
                 ),
                 # EVENTS - Music
-                Item(
+                dict(
                     type=ItemType.EVENT,
                     title="Live Music Concert",
                     description="Local bands performing live. Food and drinks available for purchase.",
@@ -145,7 +146,7 @@ async def init_db():
                     user_id=test_user.id,
                     count=0,
                 ),
-                                Item(
+                                dict(
                     type=ItemType.EVENT,
                     title="East Bangalore Farmers' Market",
                     description="Local farmers bring fresh produce and handmade goods to Avalahalli every weekend.",
@@ -161,7 +162,7 @@ async def init_db():
                 ),
                 
                 # DEALS - Food
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="Half-off at Local Cafe",
                     description="Get 50% off all drinks at the neighborhood cafe this weekend.",
@@ -176,7 +177,7 @@ async def init_db():
                     count=0,
                 ),
                 # DEALS - Sale
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="Buy One Get One Free Books",
                     description="Buy any book and get another of equal or lesser value for free.",
@@ -191,7 +192,7 @@ async def init_db():
                     count=0,
                 ),
                 # DEALS - Workshop
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="Discounted Yoga Workshop",
                     description="Join our yoga workshop series at 30% off the regular price.",
@@ -206,7 +207,7 @@ async def init_db():
                     count=0,
                 ),
                 # DEALS - Community Meetup
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="Community Center Discount",
                     description="Book our community center for your next event at a special rate.",
@@ -221,7 +222,7 @@ async def init_db():
                     count=0,
                 ),
                 # DEALS - Music
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="Music Store Sale",
                     description="20% off all instruments and accessories at our local music store.",
@@ -235,7 +236,7 @@ async def init_db():
                     user_id=test_user.id,
                     count=0,
                 ),
-                Item(
+                dict(
                     type=ItemType.DEAL,
                     title="50% Off Street Eats",
                     description="Get half-price on popular street food stalls in Chikkabanahalli this month.",
@@ -251,11 +252,9 @@ async def init_db():
                 ),
             ]
             
-            for item in sample_items:
-                session.add(item)
-            
+            result = await bulk_insert_items(session, list(enumerate(sample_items)))
             await session.commit()
-            print(f"Database initialized with {len(sample_items)} sample items!")
+            print(f"Database initialized with {len(result.created)} sample items!")
         elif item_count > 0:
             print("Database already contains items, skipping item initialization.")
         else:
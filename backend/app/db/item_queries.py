@@ -0,0 +1,245 @@
+import math
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import ARRAY, Float, Integer, Select, and_, any_, func, literal, or_, select, tuple_
+from sqlalchemy.orm import aliased
+
+from app.models.item import Item
+from app.schemas.item import FilterOptions, ItemSort
+from app.utils.geohash import cover_bounding_box, prefix_range
+from app.utils.location import (
+    EARTH_RADIUS_KM,
+    EQUIRECTANGULAR_MARGIN,
+    EQUIRECTANGULAR_MAX_LATITUDE,
+    EQUIRECTANGULAR_MAX_RADIUS_KM,
+    get_bounding_box,
+)
+
+# Text search configuration used by Item.search_vector
+SEARCH_CONFIG = "english"
+
+# Columns needed by list cards and map markers; the full description is left out
+SUMMARY_COLUMNS = (
+    Item.id,
+    Item.type,
+    Item.title,
+    Item.category,
+    Item.start_date,
+    Item.end_date,
+    Item.address,
+    Item.latitude,
+    Item.longitude,
+    Item.image,
+    Item.created_at,
+)
+
+
+# Every column an exported or fully serialized item needs, without the search vector
+EXPORT_COLUMNS = SUMMARY_COLUMNS + (
+    Item.description,
+    Item.user_id,
+    Item.updated_at,
+    Item.count,
+)
+
+
+def summary_columns(description_length: int = 0) -> list:
+    """
+    Columns for the summary projection, optionally with the description truncated in SQL.
+    """
+    columns = list(SUMMARY_COLUMNS)
+    if description_length > 0:
+        columns.append(func.left(Item.description, description_length).label("description"))
+    return columns
+
+
+def distance_expression(lat: float, lng: float):
+    """
+    SQL equirectangular distance (km) from (lat, lng) to each item.
+    Mirrors app.utils.location.approximate_distances so SQL and Python agree.
+    """
+    lat_rad = math.radians(lat)
+    item_lat_rad = func.radians(Item.latitude)
+    # Longitude difference wrapped to [-180, 180) like Python's modulo (Postgres has no float mod)
+    shifted = Item.longitude - lng + 180.0
+    dlon = shifted - 360.0 * func.floor(shifted / 360.0) - 180.0
+    x = func.radians(dlon) * func.cos((item_lat_rad + lat_rad) * 0.5)
+    y = item_lat_rad - lat_rad
+    return (EARTH_RADIUS_KM * func.sqrt(func.power(x, 2) + func.power(y, 2))).cast(Float)
+
+
+def search_query(term: str):
+    """
+    Parse free-form user input into a tsquery (quoted phrases, OR and -negation supported).
+    """
+    return func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+
+def longest_duration():
+    """
+    Scalar subquery for the longest end_date - start_date of any item, served by ix_items_duration.
+    """
+    other = aliased(Item, name="longest")
+    return select(func.max(other.end_date - other.start_date)).scalar_subquery()
+
+
+def apply_item_filters(
+    query: Select, filters: FilterOptions, item_ids: Optional[Iterable[UUID]] = None
+) -> Select:
+    """
+    Apply the listing filters to a select over Item.
+    When item_ids is given (resolved by the in-process spatial index) it replaces the location filter.
+    """
+    if filters.category:
+        query = query.where(Item.category == filters.category)
+    if filters.type:
+        query = query.where(Item.type == filters.type)
+    if filters.search_term:
+        # Full-text match on the GIN-indexed document, with a trigram-indexed
+        # title match so partially typed words still find results
+        query = query.where(
+            or_(
+                Item.search_vector.op("@@")(search_query(filters.search_term)),
+                Item.title.ilike(f"%{filters.search_term}%"),
+            )
+        )
+    if filters.start_date:
+        query = query.where(Item.start_date >= filters.start_date)
+    if filters.end_date:
+        query = query.where(Item.start_date <= filters.end_date)
+    if filters.ends_after:
+        # With the start_date bounds above, this is the (start_date, end_date) overlap test
+        query = query.where(Item.end_date >= filters.ends_after)
+        # Nothing still running started before ends_after minus the longest duration. The
+        # planner cannot infer that from end_date, so state it: start_date-ordered scans
+        # then begin there instead of walking every ended item
+        query = query.where(Item.start_date >= literal(filters.ends_after, Item.end_date.type) - longest_duration())
+    if filters.created_by:
+        query = query.where(Item.user_id == filters.created_by)
+
+    if item_ids is not None:
+        # One array parameter however many ids the index found; an IN list binds each id
+        # separately and runs into asyncpg's 32767 argument limit
+        return query.where(Item.id == any_(literal(list(item_ids), ARRAY(Item.id.type))))
+
+    if filters.lat is not None and filters.lng is not None:
+        try:
+            bbox = get_bounding_box(filters.lat, filters.lng, filters.radius)
+        except ValueError:
+            # No usable box; the radius check on the loaded rows still applies
+            bbox = None
+
+        if bbox is not None:
+            # Cover the circle with a few geohash cells; each becomes an index range scan
+            query = apply_bbox_filter(query, bbox)
+
+        # Trim the bounding box corners in SQL so pages come back nearly full
+        if filters.radius <= EQUIRECTANGULAR_MAX_RADIUS_KM and abs(filters.lat) <= EQUIRECTANGULAR_MAX_LATITUDE:
+            query = query.where(
+                distance_expression(filters.lat, filters.lng) <= filters.radius * EQUIRECTANGULAR_MARGIN
+            )
+
+    return query
+
+
+def apply_bbox_filter(query: Select, bbox: Tuple[float, float, float, float]) -> Select:
+    """
+    Restrict a select over Item to a (min_lat, min_lng, max_lat, max_lng) box,
+    with geohash cell ranges so the geohash index drives the scan.
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    cell_ranges = []
+    for prefix in cover_bounding_box(min_lat, min_lng, max_lat, max_lng):
+        if not prefix:
+            cell_ranges = []
+            break
+        range_start, range_end = prefix_range(prefix)
+        cell_ranges.append(and_(Item.geohash >= range_start, Item.geohash < range_end))
+    if cell_ranges:
+        query = query.where(or_(*cell_ranges))
+
+    return query.where(
+        and_(
+            Item.latitude >= min_lat,
+            Item.latitude <= max_lat,
+            Item.longitude >= min_lng,
+            Item.longitude <= max_lng
+        )
+    )
+
+
+def cluster_query(filters: FilterOptions, bbox: Tuple[float, float, float, float], cell_degrees: float) -> Select:
+    """
+    Count filtered items per (grid cell, category) inside bbox.
+    Cells are cell_degrees square and anchored at 0,0, so they line up across requests.
+    """
+    lat_cell = func.floor(Item.latitude / cell_degrees).cast(Integer).label("lat_cell")
+    lng_cell = func.floor(Item.longitude / cell_degrees).cast(Integer).label("lng_cell")
+    query = select(
+        lat_cell,
+        lng_cell,
+        Item.category,
+        func.count(Item.id).label("count"),
+        func.sum(Item.latitude).label("lat_sum"),
+        func.sum(Item.longitude).label("lng_sum"),
+    ).group_by(lat_cell, lng_cell, Item.category)
+    return apply_bbox_filter(apply_item_filters(query, filters), bbox)
+
+
+def sort_expression(sort: ItemSort, filters: FilterOptions):
+    """
+    Return (expression, descending) used to order and page through items.
+    """
+    if sort == ItemSort.RELEVANCE:
+        rank = func.ts_rank_cd(Item.search_vector, search_query(filters.search_term))
+        return rank.cast(Float), True
+    if sort == ItemSort.DISTANCE:
+        return distance_expression(filters.lat, filters.lng), False
+    if sort == ItemSort.CREATED_AT:
+        return Item.created_at, True
+    return Item.start_date, False
+
+
+def apply_keyset(
+    query: Select,
+    sort: ItemSort,
+    filters: FilterOptions,
+    limit: int,
+    after: Optional[tuple] = None,
+) -> Select:
+    """
+    Order the query by the sort key (with id as tiebreaker) and fetch one page after the cursor.
+    One extra row is fetched so the caller can tell whether another page exists.
+    """
+    key, descending = sort_expression(sort, filters)
+    sort_key = key.label("sort_key")
+    query = query.add_columns(sort_key)
+
+    if after is not None:
+        last_value, last_id = after
+        boundary = tuple_(literal(last_value, key.type), literal(last_id, Item.id.type))
+        if descending:
+            query = query.where(tuple_(key, Item.id) < boundary)
+        else:
+            query = query.where(tuple_(key, Item.id) > boundary)
+
+    if descending:
+        query = query.order_by(key.desc(), Item.id.desc())
+    else:
+        query = query.order_by(key.asc(), Item.id.asc())
+
+    return query.limit(limit + 1)
+
+
+def listing_watermark_query(filters: FilterOptions) -> Select:
+    """
+    Aggregate over the rows a listing could contain. Any insert, edit, delete or
+    flushed view among them changes at least one of max(updated_at), count or sum(count).
+    """
+    query = select(
+        func.max(Item.updated_at),
+        func.count(Item.id),
+        func.coalesce(func.sum(Item.count), 0),
+    )
+    return apply_item_filters(query, filters)
@@ -0,0 +1,174 @@
+import itertools
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+import orjson
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.db.item_queries import (
+    SUMMARY_COLUMNS,
+    apply_item_filters,
+    apply_keyset,
+    cluster_query,
+    listing_watermark_query,
+)
+from app.models.item import CategoryEnum, Item, ItemType
+from app.schemas.item import FilterOptions, ItemSort
+from app.utils.time_windows import resolve_time_window
+
+# Filters get_items can combine; each check covers every subset of them
+FILTER_NAMES = ("category", "type", "search", "start_date", "end_date", "created_by", "location")
+# Time windows, checked with every filter subset. "default" leaves out ended items; the
+# others are the include_expired, upcoming, ongoing and happening_between parameters
+TIME_WINDOWS = ("default", "include_expired", "upcoming", "ongoing", "happening_between")
+
+# Query kinds that aggregate or stream every matching row rather than fetch a page
+FULL_SCAN_KINDS = ("export", "watermark")
+# Filters that keep a large share of the table: two item types, open-ended date bounds and
+# the expiry cut-off. Exports and watermarks filtered only by these read most of the table by
+# design, so a sequential scan is the right plan for them. Every other sequential scan of a
+# large table fails the check: pages and narrow filters must always come from an index.
+BROAD_FILTERS = frozenset({"type", "start_date", "end_date", "include_expired"})
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) around a select, compiled with the select's own bind parameters.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _filter_options(
+    names: Tuple[str, ...], window: str, user_id: uuid.UUID, lat: float, lng: float
+) -> FilterOptions:
+    now = datetime.now(timezone.utc)
+    # Resolved the way get_items does, so combined bounds match what requests produce
+    resolved = resolve_time_window(
+        now,
+        start_date=now if "start_date" in names else None,
+        end_date=now + timedelta(days=30) if "end_date" in names else None,
+        happening_between=(now + timedelta(days=5), now + timedelta(days=7)) if window == "happening_between" else None,
+        upcoming_days=7 if window == "upcoming" else None,
+        ongoing=window == "ongoing",
+        include_expired=window == "include_expired",
+    )
+    return FilterOptions(
+        category=CategoryEnum.FOOD if "category" in names else None,
+        type=ItemType.EVENT if "type" in names else None,
+        search_term="market" if "search" in names else None,
+        start_date=resolved.starts_after,
+        end_date=resolved.starts_before,
+        ends_after=resolved.ends_after,
+        created_by=user_id if "created_by" in names else None,
+        lat=lat if "location" in names else None,
+        lng=lng if "location" in names else None,
+    )
+
+
+def listing_queries(user_id: uuid.UUID, lat: float, lng: float) -> Iterator[Tuple[str, str, Tuple[str, ...], Any]]:
+    """
+    Every (label, kind, filter names, select) shape GET /api/items and its watermark,
+    export and cluster queries can produce, across all filter subsets, time windows,
+    sort orders and first/next pages. A window other than "default" counts as a filter name.
+    """
+    for window in TIME_WINDOWS:
+        for size in range(len(FILTER_NAMES) + 1):
+            for filter_names in itertools.combinations(FILTER_NAMES, size):
+                yield from _shape_queries(filter_names, window, user_id, lat, lng)
+
+
+def _shape_queries(
+    filter_names: Tuple[str, ...], window: str, user_id: uuid.UUID, lat: float, lng: float
+) -> Iterator[Tuple[str, str, Tuple[str, ...], Any]]:
+    filters = _filter_options(filter_names, window, user_id, lat, lng)
+    names = filter_names if window == "default" else filter_names + (window,)
+    label = "+".join(names) or "no filters"
+
+    sorts = [ItemSort.START_DATE, ItemSort.CREATED_AT]
+    if "location" in names:
+        sorts.append(ItemSort.DISTANCE)
+    if "search" in names:
+        sorts.append(ItemSort.RELEVANCE)
+    for sort in sorts:
+        after_value = 1.0 if sort in (ItemSort.DISTANCE, ItemSort.RELEVANCE) else datetime.now(timezone.utc)
+        for after in (None, (after_value, uuid.uuid4())):
+            query = apply_keyset(apply_item_filters(select(Item), filters), sort, filters, 100, after)
+            page = "next page" if after else "first page"
+            yield f"list [{label}] sort={sort.value} {page}", "list", names, query
+
+    yield f"watermark [{label}]", "watermark", names, listing_watermark_query(filters)
+    yield f"export [{label}]", "export", names, apply_item_filters(select(*SUMMARY_COLUMNS), filters)
+    if "location" not in names:
+        bbox = (lat - 0.5, lng - 0.5, lat + 0.5, lng + 0.5)
+        yield f"clusters [{label}]", "clusters", names, cluster_query(filters, bbox, 0.01)
+
+
+def _sequential_scans(plan: Dict[str, Any], processes: int = 1) -> Iterator[Tuple[str, float]]:
+    """
+    Yield (relation, estimated rows kept) for every sequential scan in a plan tree.
+    """
+    processes = plan.get("Workers Planned", processes - 1) + 1
+    if plan.get("Node Type") == "Seq Scan":
+        # Parallel scans estimate rows per process
+        rows = plan["Plan Rows"] * (processes if plan.get("Parallel Aware") else 1)
+        yield plan.get("Relation Name"), rows
+    for child in plan.get("Plans", ()):
+        yield from _sequential_scans(child, processes)
+
+
+async def check_query_plans(session: AsyncSession, max_seq_scan_rows: int) -> List[str]:
+    """
+    EXPLAIN every listing query shape and report those that sequentially scan a table of
+    more than max_seq_scan_rows rows, except exports and watermarks over BROAD_FILTERS only.
+    Returns one message per offending plan.
+    """
+    await session.execute(text("ANALYZE items"))
+    await session.execute(text("ANALYZE users"))
+
+    table_rows = dict(
+        (await session.execute(
+            text("SELECT relname, reltuples::bigint FROM pg_class WHERE relname IN ('items', 'users')")
+        )).all()
+    )
+    if table_rows.get("items", 0) <= max_seq_scan_rows:
+        print(
+            f"Note: items has about {table_rows.get('items', 0)} rows, at most the {max_seq_scan_rows} row "
+            "threshold, so no plan can fail; load more data for a meaningful check"
+        )
+
+    # Real values make the planner's estimates representative of production requests
+    sample = (await session.execute(
+        select(Item.user_id, Item.latitude, Item.longitude).limit(1)
+    )).first()
+    user_id, lat, lng = sample if sample else (uuid.uuid4(), 0.0, 0.0)
+
+    failures = []
+    checked = 0
+    for label, kind, names, query in listing_queries(user_id, lat, lng):
+        if kind in FULL_SCAN_KINDS and BROAD_FILTERS.issuperset(names):
+            continue
+        result = (await session.execute(Explain(query))).scalar_one()
+        plan = orjson.loads(result) if isinstance(result, (str, bytes)) else result
+        checked += 1
+        for relation, kept in _sequential_scans(plan[0]["Plan"]):
+            rows = table_rows.get(relation, 0)
+            if rows > max_seq_scan_rows:
+                failures.append(
+                    f"{label}: sequential scan reads all {rows} rows of {relation} to keep about {int(kept)}"
+                )
+
+    print(f"Checked {checked} query plans, {len(failures)} with sequential scans")
+    return failures
@@ -0,0 +1,131 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Parameters are logged for slow statements; keep huge bulk inserts from flooding the log
+MAX_LOGGED_PARAMETERS_CHARS = 1000
+
+
+class QueryStats:
+    """
+    Statements executed within one request (or one `track_queries` block).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """
+        Statements run at least `threshold` times: the same query shape issued once per row
+        of an earlier result, i.e. a likely N+1.
+        """
+        threshold = threshold or settings.DB_N_PLUS_ONE_THRESHOLD
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query",
+            extra={
+                "duration_ms": round(elapsed * 1000, 2),
+                "statement": statement,
+                "parameters": repr(parameters)[:MAX_LOGGED_PARAMETERS_CHARS],
+                "executemany": executemany,
+            },
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("query_started") if exception_context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count and time every statement on `engine` (the sync engine behind the async one).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_queries():
+    """
+    Collect the statements run inside the block, e.g. in tests:
+
+        with track_queries() as queries:
+            client.get("/api/items")
+        assert queries.count <= 2 and not queries.repeated()
+
+    Blocks nest; the enclosing request or block keeps its own counts.
+    """
+    outer = _current.get()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        if outer is not None:
+            outer.count += stats.count
+            outer.seconds += stats.seconds
+            outer.statements.update(stats.statements)
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_repeated: bool = False):
+    """
+    Fail with AssertionError when the block runs more than `max_queries` statements
+    or, unless `allow_repeated`, repeats one often enough to look like an N+1.
+    """
+    with track_queries() as stats:
+        yield stats
+    problems: List[str] = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries, budget is {max_queries}")
+    if not allow_repeated:
+        problems.extend(f"{n}x {statement}" for statement, n in stats.repeated().items())
+    if problems:
+        raise AssertionError("Query budget exceeded:\n" + "\n".join(problems))
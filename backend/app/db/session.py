@@ -1,20 +0,0 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-DATABASE_URL = settings.DATABASE_URL  
-
-# Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
-
-# Create async session factory
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
-
-# Dependency for FastAPI routes (if using FastAPI)
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
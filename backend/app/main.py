@@ -1,16 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 import os
 
 from app.api.api import api_router
+from app.api.endpoints.images import router as images_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.static import router as static_router
 from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.security import PasswordHashingBusy
+from app.db.change_feed import change_feed
+from app.db.counters import view_counter
+from app.db.database import async_session
+from app.utils.image_derivatives import shutdown_executor as shutdown_image_workers
+from app.middleware.body_limit import BodySizeLimitMiddleware
+from app.middleware.timing import RequestTimingMiddleware
+from app.utils.spatial_index import spatial_index
 
 
 from app.api.endpoints.uploads import router as uploads_router  # Make sure path is correct
 
 
 
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -18,23 +31,92 @@ app = FastAPI(
     version=settings.APP_VERSION,
 )
 
+# Cap upload bodies before multipart parsing spools them; added before CORS so
+# its 413s still get CORS headers. The headroom covers multipart framing.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_BYTES + 64 * 1024,
+    path_prefixes=["/api/uploads"],
+)
+# The whole batch is parsed into memory, so its size is capped as well as its record count
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.ITEMS_BULK_MAX_BYTES,
+    path_prefixes=["/api/items/bulk"],
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# Mount static files directory for serving uploaded files
-uploads_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
-os.makedirs(uploads_dir, exist_ok=True)
-app.mount("/static", StaticFiles(directory=uploads_dir), name="static")
+# Outermost, so the timings cover every other middleware too
+query_headers = settings.DEBUG or settings.DB_QUERY_HEADERS
+if settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED or query_headers:
+    app.add_middleware(
+        RequestTimingMiddleware,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        query_headers=query_headers,
+    )
+
+# Serve uploaded and derived images with long-lived caching, validators and byte ranges.
+# Derived images are rendered on first request, so their route goes first.
+os.makedirs(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"), exist_ok=True)
+app.include_router(images_router)
+app.include_router(static_router)
 
 app.include_router(api_router, prefix="/api")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 app.include_router(uploads_router, prefix="/api")
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+async def build_spatial_index():
+    if settings.SPATIAL_INDEX_ENABLED:
+        async with async_session() as session:
+            await spatial_index.rebuild(session)
+
+
+@app.on_event("startup")
+async def start_view_counter():
+    view_counter.start()
+
+
+@app.on_event("shutdown")
+async def stop_view_counter():
+    # Flush buffered view counts before the worker exits
+    await view_counter.stop()
+
+
+@app.on_event("startup")
+async def start_change_feed():
+    change_feed.start()
+
+
+@app.on_event("shutdown")
+async def stop_change_feed():
+    await change_feed.stop()
+
+
+@app.on_event("shutdown")
+async def stop_image_workers():
+    shutdown_image_workers()
+
+
 @app.get("/")
 async def root():
     return {
@@ -1,31 +1,61 @@
+import hashlib
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from uuid import UUID
 
 from app.core.config import settings
-from app.core.security import verify_password
+from app.core.security import verify_and_update_password
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.utils.cache import TTLCache
+from app.utils.timing import stage
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified tokens -> detached snapshot of the resolved user
+user_cache = TTLCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _detached_copy(user: User) -> User:
+    # Snapshot the loaded columns so the cached object never shares state with a session
+    snapshot = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_user_cache(user_id: UUID):
+    user_cache.invalidate(lambda cached: cached.id == user_id)
+
 async def get_user_by_email(db: AsyncSession, email: str):
-    query = await db.execute(User.__table__.select().where(User.email == email))
-    user_id = query.scalar_one_or_none()
-    if user_id is not None:
-        return await db.get(User, user_id)
-    return None
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
 
 
 async def authenticate_user(db: AsyncSession, email: str, password: str):
-    user = await get_user_by_email(db, email)
+    with stage("db"):
+        user = await get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    with stage("password"):
+        valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Stored hash used an outdated work factor; persisted when the request commits
+        user.hashed_password = new_hash
     return user
 
 
@@ -38,6 +68,12 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    token_key = _token_key(token)
+    cached_user = user_cache.get(token_key)
+    if cached_user is not None:
+        # Attach a per-request copy to this session without a round trip
+        return await db.merge(cached_user, load=False)
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -46,17 +82,20 @@ async def get_current_user(
         if user_id is None:
             raise credentials_exception
         token_data = TokenData(user_id=user_id)
-    except JWTError:
+        user_uuid = UUID(token_data.user_id)
+    except (JWTError, ValueError):
         raise credentials_exception
-        
-    query = await db.execute(User.__table__.select().where(User.id == UUID(token_data.user_id)))
-    user_id = query.scalar_one_or_none()
-    
-    if user_id is None:
-        raise credentials_exception
-    
-    user = await db.get(User, user_id)
+
+    user = await db.get(User, user_uuid)
     if user is None:
         raise credentials_exception
-    
+
+    # Never cache past the token's own expiry
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        user_cache.set(token_key, _detached_copy(user), ttl)
+
     return user
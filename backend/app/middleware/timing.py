@@ -0,0 +1,82 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import start_query_stats
+from app.utils.metrics import (
+    db_n_plus_one_total,
+    db_queries_per_request,
+    db_query_seconds_per_request,
+    http_request_duration_seconds,
+    http_requests_total,
+    request_stage_duration_seconds,
+)
+from app.utils.timing import start_request_timings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimingMiddleware:
+    """
+    Time every request, per stage and in total, and count its SQL statements. Adds a
+    Server-Timing header when enabled, X-DB-* headers when `query_headers` is set, and
+    records request, stage and query histograms keyed by route template.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, query_headers: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+        self.query_headers = query_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        queries = start_query_stats()
+        status_code = 500
+
+        async def timed_send(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Streamed bodies are still being produced; the headers cover work done so far
+                headers = list(message.get("headers", []))
+                if self.server_timing:
+                    value = timings.server_timing()
+                    if queries.count:
+                        value = f'sql;desc="{queries.count} queries";dur={queries.seconds * 1000:.2f}, {value}'
+                    headers.append((b"server-timing", value.encode()))
+                if self.query_headers:
+                    headers.append((b"x-db-queries", str(queries.count).encode()))
+                    headers.append((b"x-db-time-ms", f"{queries.seconds * 1000:.2f}".encode()))
+                    repeated = queries.repeated()
+                    if repeated:
+                        headers.append((b"x-db-n-plus-one", str(max(repeated.values())).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            elapsed = time.perf_counter() - timings.started
+            # Templates, not raw paths, so ids do not explode the label set
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests_total.inc(method, route_label, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route_label)
+            for name, seconds in timings.stages.items():
+                request_stage_duration_seconds.observe(seconds, route_label, name)
+            db_queries_per_request.observe(queries.count, route_label)
+            db_query_seconds_per_request.observe(queries.seconds, route_label)
+            repeated = queries.repeated()
+            if repeated:
+                db_n_plus_one_total.inc(route_label)
+                for statement, n in repeated.items():
+                    logger.warning(
+                        "Repeated query",
+                        extra={"route": route_label, "method": method, "times": n, "statement": statement},
+                    )
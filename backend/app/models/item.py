@@ -1,10 +1,11 @@
-from sqlalchemy import Column,Integer, String, DateTime, Float, ForeignKey, Text, Enum, func
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column,Integer, String, DateTime, Float, ForeignKey, Text, Enum, Computed, DDL, Index, event, func
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 import uuid
 import enum
 
 from app.db.database import Base
+from app.utils.geohash import GEOHASH_PRECISION, encode as geohash_encode
 
 
 class ItemType(str, enum.Enum):
@@ -34,9 +35,23 @@ class Item(Base):
     address = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Precomputed spatial cell key, indexed for prefix range lookups.
+    # "C" collation keeps string ordering identical to geohash prefix ordering.
+    geohash = Column(String(GEOHASH_PRECISION, collation="C"), nullable=True, index=True)
     image = Column(String, nullable=True)
     count = Column(Integer, nullable=True, default=0)
 
+    # Full-text document over title (weight A) and description (weight B), maintained by Postgres.
+    # Deferred so listings never load it.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+
     
     # Foreign key to user
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -46,3 +61,38 @@ class Item(Base):
     
     # Relationships
     user = relationship("User", back_populates="items")
+
+    __table_args__ = (
+        # Listing filters paired with the (sort key, id) keyset order; see the
+        # c5e8a2d41f37 migration and `python start.py --check-plans`
+        Index("ix_items_start_date_id", "start_date", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_category_start_date", "category", "start_date", "id"),
+        Index("ix_items_type_start_date", "type", "start_date", "id"),
+        Index("ix_items_user_id_start_date", "user_id", "start_date", "id"),
+        # Time window counts and watermarks (end_date >= window start, start_date <= window end)
+        Index("ix_items_end_date_start_date", "end_date", "start_date"),
+        Index("ix_items_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram index so partial-word title matches (ILIKE '%term%') can use an index
+        Index(
+            "ix_items_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+
+
+# Longest item duration in one index probe; see item_queries.apply_item_filters
+Index("ix_items_duration", Item.end_date - Item.start_date)
+
+# The trigram operator class lives in the pg_trgm extension
+event.listen(Item.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+@event.listens_for(Item, "before_insert")
+@event.listens_for(Item, "before_update")
+def _sync_geohash(mapper, connection, target):
+    # Keep the cell key in step with the coordinates on every create/update
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = geohash_encode(target.latitude, target.longitude)
@@ -1,9 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import List, Optional, Dict
 from datetime import datetime
 from uuid import UUID
+import enum
 
 from app.models.item import ItemType, CategoryEnum
+from app.utils.serializers import serialize_item
 
 
 class LocationModel(BaseModel):
@@ -11,6 +13,12 @@ class LocationModel(BaseModel):
     lng: float
 
 
+class ImageDerivative(BaseModel):
+    width: int
+    url: str
+    webp: str
+
+
 class ItemBase(BaseModel):
     title: str
     description: str
@@ -54,10 +62,12 @@ class ItemResponse(BaseModel):
     address: str
     location: LocationModel
     image: Optional[str] = None
+    image_derivatives: Optional[List[ImageDerivative]] = Field(None, alias="imageDerivatives")
     created_by: UUID = Field(alias="createdBy")
     created_at: datetime = Field(alias="createdAt")
     updated_at: datetime = Field(alias="updatedAt")
     count: int
+    distance: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -66,14 +76,47 @@ class ItemResponse(BaseModel):
 
     @classmethod
     def from_orm(cls, item):
-        # Create a copy of the item to avoid modifying the original
-        item_copy = item.__dict__.copy()
+        # Read only the mapped fields instead of copying item.__dict__ (and its SQLAlchemy state)
+        return cls.model_validate(serialize_item(item))
+
+
+class ItemSummaryResponse(BaseModel):
+    """
+    Compact item shape for list cards and map markers (view=summary).
+    """
+    id: UUID
+    title: str
+    description: Optional[str] = None
+    category: CategoryEnum
+    type: ItemType
+    start_date: datetime = Field(alias="startDate")
+    end_date: datetime = Field(alias="endDate")
+    address: str
+    location: LocationModel
+    image: Optional[str] = None
+    image_derivatives: Optional[List[ImageDerivative]] = Field(None, alias="imageDerivatives")
+    created_at: datetime = Field(alias="createdAt")
+    distance: Optional[float] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class ItemView(str, enum.Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
 
-        # Map fields to match frontend expectations
-        item_copy["created_by"] = item.user_id
-        item_copy["location"] = {"lat": item.latitude, "lng": item.longitude}
 
-        return cls.model_validate(item_copy)
+class ItemSort(str, enum.Enum):
+    START_DATE = "start_date"
+    CREATED_AT = "created_at"
+    DISTANCE = "distance"
+    RELEVANCE = "relevance"
 
 
 class FilterOptions(BaseModel):
@@ -81,4 +124,10 @@ class FilterOptions(BaseModel):
     type: Optional[ItemType] = None
     search_term: Optional[str] = None
     start_date: Optional[datetime] = None
-    end_date: Optional[datetime] = None
\ No newline at end of file
+    end_date: Optional[datetime] = None
+    # Item still running at or after this time (end_date >= ends_after)
+    ends_after: Optional[datetime] = None
+    created_by: Optional[UUID] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    radius: float = 20.0  # Default radius of 20km
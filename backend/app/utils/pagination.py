@@ -0,0 +1,51 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.schemas.item import ItemSort
+
+
+def encode_cursor(sort: ItemSort, value: Any, item_id: UUID) -> str:
+    """
+    Build an opaque cursor pointing just after the given (sort value, id) position.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort.value, value, str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: ItemSort) -> Tuple[Any, UUID]:
+    """
+    Decode a cursor created by encode_cursor.
+    Raises ValueError if the cursor is malformed or was issued for another sort mode.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort.value:
+            raise ValueError("Cursor does not match the requested sort order")
+        if sort in (ItemSort.DISTANCE, ItemSort.RELEVANCE):
+            value = float(value)
+        else:
+            value = datetime.fromisoformat(value)
+        return value, UUID(item_id)
+    except (TypeError, ValueError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_page(
+    keys: Dict[UUID, float], limit: int, after: Optional[Tuple[float, UUID]] = None
+) -> Tuple[List[UUID], bool]:
+    """
+    In-process counterpart of apply_keyset for ascending (key, id) order: the ids of the
+    page after the cursor position, and whether another page follows.
+    """
+    candidates = ((key, item_id) for item_id, key in keys.items())
+    if after is not None:
+        candidates = (candidate for candidate in candidates if candidate > after)
+    page = heapq.nsmallest(limit + 1, candidates)
+    return [item_id for _, item_id in page[:limit]], len(page) > limit
@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.location import get_bounding_box
+
+
+class CacheScope(NamedTuple):
+    """
+    What a cached listing depends on. None means the listing is not narrowed on that axis.
+    """
+    category: Optional[str] = None
+    type: Optional[str] = None
+    created_by: Optional[UUID] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None
+
+    def affected_by(self, category: str, type: str, user_id: UUID, lat: float, lng: float) -> bool:
+        if self.category is not None and self.category != category:
+            return False
+        if self.type is not None and self.type != type:
+            return False
+        if self.created_by is not None and self.created_by != user_id:
+            return False
+        if self.bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = self.bbox
+            if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+                return False
+        return True
+
+
+def snap_to_grid(value: float, grid_degrees: float) -> float:
+    """
+    Quantize a coordinate so nearby viewports share one cache entry.
+    """
+    return round(round(value / grid_degrees) * grid_degrees, 6)
+
+
+def location_scope_bbox(lat: float, lng: float, radius_km: float) -> Optional[Tuple[float, float, float, float]]:
+    try:
+        return get_bounding_box(lat, lng, radius_km)
+    except ValueError:
+        # The box wraps a pole; treat the listing as global
+        return None
+
+
+class QueryCache:
+    """
+    LRU cache of rendered item listings.
+    Concurrent misses for the same key share one load, and writes drop only the
+    entries whose scope covers the written item.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        cached = self._cache.get(key)
+        return None if cached is None else cached[1]
+
+    async def get_or_load(self, key: Hashable, scope: CacheScope, loader: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return await self.load(key, scope, loader)
+
+    async def load(self, key: Hashable, scope: CacheScope, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run the loader and store its result, sharing the run with concurrent callers for the same key.
+        """
+        # Join a load already running for this key
+        while key in self._inflight:
+            pending = self._inflight[key]
+            try:
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading request went away; try again
+                continue
+            self.coalesced += 1
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a load without followers does not log a warning
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(value)
+        # A write landed during the load; the result may predate it
+        if generation == self._generation:
+            self._cache.set(key, (scope, value))
+        return value
+
+    @property
+    def generation(self) -> int:
+        """
+        Bumped by every invalidation; read it before a load that is stored with set().
+        """
+        return self._generation
+
+    def set(self, key: Hashable, scope: CacheScope, value: Any, generation: Optional[int] = None):
+        """
+        Store a value loaded outside load(), unless a write landed since `generation` was read.
+        """
+        if generation is None or generation == self._generation:
+            self._cache.set(key, (scope, value))
+
+    def invalidate_item(self, category: str, type: str, user_id: UUID, lat: float, lng: float) -> int:
+        """
+        Drop cached listings that could include an item with these attributes.
+        """
+        self._generation += 1
+        self._inflight.clear()
+        removed = self._cache.invalidate(
+            lambda entry: entry[0].affected_by(category, type, user_id, lat, lng)
+        )
+        self.invalidations += removed
+        return removed
+
+    def clear(self):
+        self._generation += 1
+        self._inflight.clear()
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        lookups = self._cache.hits + self._cache.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "hit_ratio": round(self._cache.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self._cache.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+query_cache = QueryCache(
+    max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+    ttl=settings.QUERY_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,82 @@
+from operator import attrgetter
+from typing import Any, Dict, Optional
+
+from app.utils.image_derivatives import derivative_urls
+
+# Fetch every response field in one call instead of attribute-by-attribute
+_item_fields = attrgetter(
+    "id", "type", "title", "description", "category",
+    "start_date", "end_date", "address", "latitude", "longitude",
+    "image", "user_id", "created_at", "updated_at", "count",
+)
+
+
+def serialize_item(item: Any, distance: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Build the ItemResponse-shaped dict for an Item (or a row with the same attributes).
+    Datetimes and enums are left as-is for orjson to encode natively; UUIDs are
+    stringified because asyncpg returns its own UUID type, which orjson rejects.
+    """
+    (
+        item_id, item_type, title, description, category,
+        start_date, end_date, address, latitude, longitude,
+        image, user_id, created_at, updated_at, count,
+    ) = _item_fields(item)
+
+    data = {
+        "id": str(item_id),
+        "type": item_type,
+        "title": title,
+        "description": description,
+        "category": category,
+        "startDate": start_date,
+        "endDate": end_date,
+        "address": address,
+        "location": {"lat": latitude, "lng": longitude},
+        "image": image,
+        "imageDerivatives": derivative_urls(image),
+        "createdBy": str(user_id),
+        "createdAt": created_at,
+        "updatedAt": updated_at,
+        "count": count or 0,
+    }
+    if distance is not None:
+        data["distance"] = round(distance, 1)
+    return data
+
+
+_summary_fields = attrgetter(
+    "id", "type", "title", "category", "start_date", "end_date",
+    "address", "latitude", "longitude", "image", "created_at",
+)
+
+
+def serialize_item_summary(row: Any, distance: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Build the ItemSummaryResponse-shaped dict for a summary projection row.
+    The (possibly truncated) description is included only when the row carries one.
+    """
+    (
+        item_id, item_type, title, category, start_date, end_date,
+        address, latitude, longitude, image, created_at,
+    ) = _summary_fields(row)
+
+    data = {
+        "id": str(item_id),
+        "type": item_type,
+        "title": title,
+        "category": category,
+        "startDate": start_date,
+        "endDate": end_date,
+        "address": address,
+        "location": {"lat": latitude, "lng": longitude},
+        "image": image,
+        "imageDerivatives": derivative_urls(image),
+        "createdAt": created_at,
+    }
+    description = getattr(row, "description", None)
+    if description is not None:
+        data["description"] = description
+    if distance is not None:
+        data["distance"] = round(distance, 1)
+    return data
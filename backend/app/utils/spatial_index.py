@@ -0,0 +1,141 @@
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.item import Item
+from app.utils.location import distances_within_radius, get_bounding_box
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedItem(NamedTuple):
+    latitude: float
+    longitude: float
+    end_date: Optional[datetime]
+    cell: Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index of active item coordinates, kept in process memory.
+    Resolves radius and bounding-box queries to item IDs without touching the database.
+    """
+
+    def __init__(self, cell_degrees: float = 0.05):
+        self.cell_degrees = cell_degrees
+        self.ready = False
+        self._cells: Dict[Tuple[int, int], Set[UUID]] = defaultdict(set)
+        self._entries: Dict[UUID, IndexedItem] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell_for(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def _insert(self, item_id: UUID, lat: float, lng: float, end_date: Optional[datetime]):
+        cell = self._cell_for(lat, lng)
+        self._entries[item_id] = IndexedItem(lat, lng, end_date, cell)
+        self._cells[cell].add(item_id)
+
+    def upsert(self, item_id: UUID, lat: float, lng: float, end_date: Optional[datetime] = None):
+        # Writes are ignored until the index has been built (or when it is disabled)
+        if not self.ready:
+            return
+        self.remove(item_id)
+        self._insert(item_id, lat, lng, end_date)
+
+    def remove(self, item_id: UUID):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        members = self._cells.get(entry.cell)
+        if members is not None:
+            members.discard(item_id)
+            if not members:
+                del self._cells[entry.cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def query_bbox(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float
+    ) -> List[UUID]:
+        """
+        Return IDs of active items inside the bounding box.
+        """
+        now = datetime.now(timezone.utc)
+        lat_lo, lng_lo = self._cell_for(min_lat, min_lng)
+        lat_hi, lng_hi = self._cell_for(max_lat, max_lng)
+
+        # Boxes around a pole or across the antimeridian span every longitude; walk the
+        # occupied cells instead when that is shorter than the box's cell range
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) > len(self._cells):
+            cells = [
+                cell for cell in self._cells
+                if lat_lo <= cell[0] <= lat_hi and lng_lo <= cell[1] <= lng_hi
+            ]
+        else:
+            cells = [
+                (lat_cell, lng_cell)
+                for lat_cell in range(lat_lo, lat_hi + 1)
+                for lng_cell in range(lng_lo, lng_hi + 1)
+            ]
+
+        matches = []
+        expired = []
+        for cell in cells:
+            for item_id in self._cells.get(cell, ()):
+                entry = self._entries[item_id]
+                if entry.end_date is not None and entry.end_date < now:
+                    expired.append(item_id)
+                    continue
+                if min_lat <= entry.latitude <= max_lat and min_lng <= entry.longitude <= max_lng:
+                    matches.append(item_id)
+
+        # Ended items are no longer active, drop them lazily
+        for item_id in expired:
+            self.remove(item_id)
+
+        return matches
+
+    def query_radius(self, lat: float, lng: float, radius_km: float) -> Dict[UUID, float]:
+        """
+        Return a mapping of item ID to distance (km) for active items within the radius.
+        """
+        # Clamped at the poles and widened across the antimeridian, like the SQL filter
+        min_lat, min_lng, max_lat, max_lng = get_bounding_box(lat, lng, radius_km)
+        candidates = self.query_bbox(min_lat, min_lng, max_lat, max_lng)
+        entries = [self._entries[item_id] for item_id in candidates]
+        keep, distances = distances_within_radius(
+            lat, lng,
+            [entry.latitude for entry in entries],
+            [entry.longitude for entry in entries],
+            radius_km,
+        )
+        return {candidates[i]: distance for i, distance in zip(keep.tolist(), distances.tolist())}
+
+    async def rebuild(self, db: AsyncSession):
+        """
+        Load every active item's coordinates from the database.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(Item.id, Item.latitude, Item.longitude, Item.end_date).where(Item.end_date >= now)
+        )
+        self.clear()
+        for row in result:
+            self._insert(row.id, row.latitude, row.longitude, row.end_date)
+        self.ready = True
+        logger.info("Spatial index built", extra={"items": len(self)})
+
+
+spatial_index = SpatialIndex(cell_degrees=settings.SPATIAL_INDEX_CELL_DEGREES)
@@ -0,0 +1,294 @@
+import mimetypes
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, status
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.etag import etag_matches
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+# Uploads are named by SHA-256 and derived images by source hash and width, so their bytes never change
+HASHED_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(?:-\d+w)?\.[a-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Checked in order of preference
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Stat results for immutable files can be kept much longer
+IMMUTABLE_STAT_TTL_SECONDS = 3600.0
+
+
+class StaticFileInfo(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+    etag: str
+    last_modified: str
+    media_type: str
+    immutable: bool
+    # encoding -> (path, size) of precompressed siblings
+    encodings: Dict[str, Tuple[str, int]]
+
+
+def _stat_regular_file(path: str) -> Optional[Tuple[int, float]]:
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(result.st_mode):
+        return None
+    return result.st_size, result.st_mtime
+
+
+def stat_static_file(path: str) -> Optional[StaticFileInfo]:
+    found = _stat_regular_file(path)
+    if found is None:
+        return None
+    size, mtime = found
+
+    encodings = {}
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        variant = _stat_regular_file(path + suffix)
+        if variant is not None:
+            encodings[encoding] = (path + suffix, variant[0])
+
+    return StaticFileInfo(
+        path=path,
+        size=size,
+        mtime=mtime,
+        etag=f'"{int(mtime * 1_000_000):x}-{size:x}"',
+        last_modified=formatdate(mtime, usegmt=True),
+        media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+        immutable=bool(HASHED_NAME_PATTERN.match(os.path.basename(path))),
+        encodings=encodings,
+    )
+
+
+class StaticFileCache:
+    """
+    Per-path cache of stat results, validators and precompressed variants, including
+    misses, so repeat requests skip the filesystem syscalls.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    async def lookup(self, path: str) -> Optional[StaticFileInfo]:
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached[0]
+
+        info = await anyio.to_thread.run_sync(stat_static_file, path)
+        ttl = IMMUTABLE_STAT_TTL_SECONDS if info is not None and info.immutable else None
+        self._cache.set(path, (info,), ttl=ttl)
+        return info
+
+    def pop(self, path: str):
+        self._cache.pop(path)
+
+    def clear(self):
+        self._cache.clear()
+
+
+static_file_cache = StaticFileCache(
+    max_entries=settings.STATIC_FILE_CACHE_MAX_ENTRIES,
+    ttl=settings.STATIC_FILE_CACHE_TTL_SECONDS,
+)
+
+
+class StaticFileResponse(Response):
+    """
+    Sends `count` bytes of a file from `offset`, handing the file to the server when it
+    advertises the ASGI pathsend or zero-copy send extensions.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        count: int,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: Optional[str] = None,
+        method: Optional[str] = None,
+        whole_file: bool = True,
+    ):
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.whole_file = whole_file
+        self.status_code = status_code
+        self.media_type = media_type
+        self.send_header_only = method is not None and method.upper() == "HEAD"
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if self.whole_file and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+
+        if "http.response.zerocopysend" in extensions:
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us; end the body rather than hang the client
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+UNSATISFIABLE = (-1, -1)
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header into an inclusive (start, end).
+    Returns None to ignore the header (malformed or multiple ranges), or UNSATISFIABLE.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                return UNSATISFIABLE
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        return UNSATISFIABLE
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _accepted_encodings(header: Optional[str]) -> set:
+    accepted = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if token and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.lower())
+    return accepted
+
+
+def _not_modified_since(request: Request, info: StaticFileInfo) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        return int(info.mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+async def serve_static_file(request: Request, path: str) -> Response:
+    info = await static_file_cache.lookup(path)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if info.immutable else REVALIDATE_CACHE_CONTROL,
+        "Last-Modified": info.last_modified,
+        "Accept-Ranges": "bytes",
+    }
+    if info.encodings:
+        headers["Vary"] = "Accept-Encoding"
+
+    range_header = request.headers.get("range")
+
+    # Precompressed variants are only used for whole-file responses
+    body_path, body_size, etag = info.path, info.size, info.etag
+    if info.encodings and not range_header:
+        accepted = _accepted_encodings(request.headers.get("accept-encoding"))
+        for encoding, (variant_path, variant_size) in info.encodings.items():
+            if encoding in accepted:
+                body_path, body_size = variant_path, variant_size
+                # Each encoding is a distinct representation and needs its own strong tag
+                etag = f'{info.etag[:-1]}-{encoding}"'
+                headers["Content-Encoding"] = encoding
+                break
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag) or (if_none_match is None and _not_modified_since(request, info)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if range_header:
+        # If-Range needs an exact strong match; otherwise the client gets the whole file
+        if_range = request.headers.get("if-range")
+        if if_range is None or if_range.strip() in (info.etag, info.last_modified):
+            byte_range = parse_byte_range(range_header, info.size)
+            if byte_range == UNSATISFIABLE:
+                headers["Content-Range"] = f"bytes */{info.size}"
+                return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+            if byte_range is not None:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+                return StaticFileResponse(
+                    info.path, start, end - start + 1,
+                    status_code=status.HTTP_206_PARTIAL_CONTENT,
+                    headers=headers,
+                    media_type=info.media_type,
+                    method=request.method,
+                    whole_file=start == 0 and end == info.size - 1,
+                )
+
+    return StaticFileResponse(
+        body_path, 0, body_size,
+        headers=headers,
+        media_type=info.media_type,
+        method=request.method,
+    )
@@ -0,0 +1,127 @@
+import asyncio
+import itertools
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.utils.location import calculate_distance
+
+# Viewports spanning more cells than this are matched against every event instead
+MAX_SUBSCRIPTION_CELLS = 256
+
+
+class Subscription:
+    """
+    One connected client's filters and its bounded queue of pending events.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        queue_size: int,
+        category: Optional[str] = None,
+        type: Optional[str] = None,
+        created_by: Optional[UUID] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        center: Optional[Tuple[float, float]] = None,
+        radius_km: Optional[float] = None,
+    ):
+        self.id = next(self._ids)
+        self.category = category
+        self.type = type
+        self.created_by = created_by
+        self.bbox = bbox
+        self.center = center
+        self.radius_km = radius_km
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set when events had to be dropped; the client must reload
+        self.overflowed = False
+        self.cells: List[Tuple[int, int]] = []
+
+    def matches(self, category: str, type: str, user_id: UUID, lat: float, lng: float) -> bool:
+        if self.category is not None and self.category != category:
+            return False
+        if self.type is not None and self.type != type:
+            return False
+        if self.created_by is not None and self.created_by != user_id:
+            return False
+        if self.bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = self.bbox
+            if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+                return False
+        if self.center is not None and self.radius_km is not None:
+            if calculate_distance(self.center[0], self.center[1], lat, lng) > self.radius_km:
+                return False
+        return True
+
+    def deliver(self, message: Any):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow client must not hold memory or block other subscribers
+            self.overflowed = True
+
+
+class SubscriptionIndex:
+    """
+    Uniform-grid index of subscriber viewports, so an event is only checked against
+    the subscriptions whose area covers its location.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], Set[Subscription]] = defaultdict(set)
+        # Subscriptions with no area, or too large an area to index by cell
+        self._unbounded: Set[Subscription] = set()
+        self._all: Set[Subscription] = set()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def __iter__(self):
+        return iter(list(self._all))
+
+    def _cell_for(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def add(self, subscription: Subscription):
+        self._all.add(subscription)
+        if subscription.bbox is None:
+            self._unbounded.add(subscription)
+            return
+
+        min_lat, min_lng, max_lat, max_lng = subscription.bbox
+        lat_lo, lng_lo = self._cell_for(min_lat, min_lng)
+        lat_hi, lng_hi = self._cell_for(max_lat, max_lng)
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) > MAX_SUBSCRIPTION_CELLS:
+            self._unbounded.add(subscription)
+            return
+
+        subscription.cells = [
+            (lat_cell, lng_cell)
+            for lat_cell in range(lat_lo, lat_hi + 1)
+            for lng_cell in range(lng_lo, lng_hi + 1)
+        ]
+        for cell in subscription.cells:
+            self._cells[cell].add(subscription)
+
+    def remove(self, subscription: Subscription):
+        self._all.discard(subscription)
+        self._unbounded.discard(subscription)
+        for cell in subscription.cells:
+            members = self._cells.get(cell)
+            if members is not None:
+                members.discard(subscription)
+                if not members:
+                    del self._cells[cell]
+        subscription.cells = []
+
+    def candidates(self, points: Iterable[Tuple[float, float]]) -> Set[Subscription]:
+        found = set(self._unbounded)
+        for lat, lng in points:
+            found.update(self._cells.get(self._cell_for(lat, lng), ()))
+        return found
@@ -0,0 +1,100 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple, Optional, Tuple, Union
+
+from pydantic import TypeAdapter
+
+# Same timestamp formats FastAPI accepts for the start_date / end_date query parameters
+_datetime = TypeAdapter(Union[datetime, date])
+
+
+class TimeWindow(NamedTuple):
+    """
+    Bounds on an item's dates; None leaves a side open.
+    start_date >= starts_after, start_date <= starts_before, end_date >= ends_after.
+    """
+
+    starts_after: Optional[datetime]
+    starts_before: Optional[datetime]
+    ends_after: Optional[datetime]
+
+
+def as_utc(value: Optional[Union[datetime, date]]) -> Optional[datetime]:
+    # Bare dates mean midnight, as when the filters were compared as strings in SQL
+    if value is not None and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    # Query strings without an offset are taken as UTC, like the stored timestamps
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def listing_clock(granularity_seconds: int) -> datetime:
+    """
+    Current time floored to granularity_seconds. Listings built within one step share
+    cache keys and ETags; the next step rolls them over as items start and end.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    return datetime.fromtimestamp(now - now % granularity_seconds, timezone.utc)
+
+
+def parse_time_range(value: str) -> Tuple[datetime, datetime]:
+    """
+    Parse a "start,end" pair of ISO 8601 timestamps. Raises ValueError when malformed.
+    """
+    parts = value.split(",")
+    if len(parts) != 2:
+        raise ValueError("happening_between must be start,end")
+    try:
+        start, end = (as_utc(_datetime.validate_python(part.strip())) for part in parts)
+    except ValueError:
+        raise ValueError("happening_between must hold two ISO 8601 timestamps")
+    if start > end:
+        raise ValueError("happening_between is inverted")
+    return start, end
+
+
+def _latest(*values: Optional[datetime]) -> Optional[datetime]:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def _earliest(*values: Optional[datetime]) -> Optional[datetime]:
+    present = [value for value in values if value is not None]
+    return min(present) if present else None
+
+
+def resolve_time_window(
+    now: datetime,
+    start_date: Optional[Union[datetime, date]] = None,
+    end_date: Optional[Union[datetime, date]] = None,
+    happening_between: Optional[Tuple[datetime, datetime]] = None,
+    upcoming_days: Optional[int] = None,
+    ongoing: bool = False,
+    include_expired: bool = False,
+) -> TimeWindow:
+    """
+    Combine the listing's time filters into one window; every filter given must hold.
+
+    start_date / end_date: the item starts within them (the original filters).
+    happening_between: the item runs at some point between the two timestamps.
+    upcoming_days: the item has not started and starts within that many days.
+    ongoing: the item has started and not yet ended.
+    Items that ended before now are left out unless include_expired.
+    """
+    starts_after = as_utc(start_date)
+    starts_before = as_utc(end_date)
+    ends_after = None if include_expired else now
+
+    if happening_between is not None:
+        # Overlap: starts before the window closes and ends after it opens
+        window_start, window_end = happening_between
+        starts_before = _earliest(starts_before, window_end)
+        ends_after = _latest(ends_after, window_start)
+    if upcoming_days is not None:
+        starts_after = _latest(starts_after, now)
+        starts_before = _earliest(starts_before, now + timedelta(days=upcoming_days))
+    if ongoing:
+        starts_before = _earliest(starts_before, now)
+        ends_after = _latest(ends_after, now)
+
+    return TimeWindow(starts_after, starts_before, ends_after)
@@ -0,0 +1,240 @@
+"""
+Bulk-load synthetic users and items for load testing.
+
+    python -m benchmarks.generate_data [--scale 1] [--seed 42] [--reset]
+
+Scale 1 is 100,000 items from 2,000 users; scale 10 is a million items. Items are
+clustered around neighbourhood hotspots in a handful of Indian cities, with Bangalore
+weighted heaviest like the init_db sample data. Every generated user signs in with
+BENCHMARK_PASSWORD. Rows are written with COPY, bypassing the ORM, so run it against
+a database that is already migrated.
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.item import CategoryEnum, ItemType
+from app.utils.geohash import encode as geohash_encode
+
+ITEMS_PER_SCALE = 100_000
+USERS_PER_SCALE = 2_000
+COPY_BATCH_SIZE = 50_000
+
+BENCHMARK_EMAIL_DOMAIN = "bench.localloop.test"
+BENCHMARK_PASSWORD = "benchmark123"
+
+# (name, lat, lng, share of items)
+CITIES = [
+    ("Bangalore", 12.9716, 77.5946, 0.40),
+    ("Mumbai", 19.0760, 72.8777, 0.15),
+    ("Delhi", 28.6139, 77.2090, 0.15),
+    ("Hyderabad", 17.3850, 78.4867, 0.10),
+    ("Chennai", 13.0827, 80.2707, 0.08),
+    ("Pune", 18.5204, 73.8567, 0.07),
+    ("Kolkata", 22.5726, 88.3639, 0.05),
+]
+
+# The init_db neighbourhoods; other cities get random hotspots around their centre
+BANGALORE_HOTSPOTS = [
+    ("Majestic", 12.977439, 77.570839),
+    ("Koramangala", 12.934533, 77.626579),
+    ("Indiranagar", 12.971891, 77.641151),
+    ("Jayanagar", 12.925007, 77.593803),
+    ("Basavanagudi", 12.9436, 77.5732),
+    ("MG Road", 12.9756, 77.6050),
+    ("Ulsoor", 12.9843, 77.6190),
+    ("Richmond Town", 12.9611, 77.6000),
+    ("Shivajinagar", 12.9918, 77.6055),
+    ("Domlur", 12.9583, 77.6384),
+    ("Whitefield", 12.9698, 77.7500),
+    ("Hebbal", 13.0358, 77.5970),
+]
+HOTSPOTS_PER_CITY = 12
+HOTSPOT_SPREAD_DEGREES = 0.12
+ITEM_SPREAD_DEGREES = 0.01
+
+TITLES = {
+    CategoryEnum.FOOD: (["Street Food", "Organic", "Home Chef", "Biryani", "Dosa", "Bakery", "Farmers"], ["Festival", "Market", "Pop-up", "Tasting", "Discount", "Brunch"]),
+    CategoryEnum.MUSIC: (["Jazz", "Indie", "Carnatic", "Acoustic", "Rock", "Open Mic"], ["Night", "Concert", "Jam Session", "Evening", "Gig"]),
+    CategoryEnum.WORKSHOP: (["Pottery", "Coding", "Yoga", "Photography", "Painting", "Gardening"], ["Workshop", "Class", "Bootcamp", "Masterclass"]),
+    CategoryEnum.SALE: (["Electronics", "Furniture", "Clothing", "Book", "Handicraft"], ["Sale", "Clearance", "Offer", "Discount"]),
+    CategoryEnum.COMMUNITY_MEETUP: (["Neighbourhood", "Residents", "Book Club", "Cycling", "Cleanup"], ["Meetup", "Gathering", "Drive", "Walk"]),
+    CategoryEnum.GARAGE_SALE: (["Moving Out", "Weekend", "Vintage", "Family", "Toy"], ["Garage Sale", "Yard Sale", "Flea Market"]),
+}
+
+DESCRIPTIONS = [
+    "Join your neighbours for {title} near {place}. Everyone is welcome, bring friends and family.",
+    "{title} at {place}: limited spots, first come first served. Local vendors and handmade goods.",
+    "Don't miss {title} this week around {place}. Great prices, live music and food stalls.",
+    "A relaxed {title} hosted by the {place} community. Free entry, parking available nearby.",
+]
+
+ITEM_COLUMNS = [
+    "id", "type", "title", "description", "category", "start_date", "end_date", "address",
+    "latitude", "longitude", "geohash", "image", "count", "user_id", "created_at", "updated_at",
+]
+
+
+def build_hotspots(rng: random.Random) -> List[Tuple[str, str, float, float, float]]:
+    """
+    (place, city, lat, lng, weight) for every hotspot, weights summing to 1.
+    """
+    hotspots = []
+    for city, lat, lng, share in CITIES:
+        if city == "Bangalore":
+            places = BANGALORE_HOTSPOTS
+        else:
+            places = [
+                (f"{city} Sector {n + 1}", lat + rng.uniform(-1, 1) * HOTSPOT_SPREAD_DEGREES, lng + rng.uniform(-1, 1) * HOTSPOT_SPREAD_DEGREES)
+                for n in range(HOTSPOTS_PER_CITY)
+            ]
+        # Uneven popularity inside a city, so some areas are much denser than others
+        popularity = [rng.paretovariate(1.2) for _ in places]
+        total = sum(popularity)
+        for (place, place_lat, place_lng), weight in zip(places, popularity):
+            hotspots.append((place, city, place_lat, place_lng, share * weight / total))
+    return hotspots
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_users(count: int, password_hash: str, rng: random.Random) -> List[tuple]:
+    now = datetime.now(timezone.utc)
+    return [
+        (seeded_uuid(rng), f"Benchmark User {n}", f"user{n}@{BENCHMARK_EMAIL_DOMAIN}", password_hash, now, now)
+        for n in range(count)
+    ]
+
+
+def generate_items(count: int, user_ids: List[uuid.UUID], rng: random.Random) -> Iterator[tuple]:
+    hotspots = build_hotspots(rng)
+    weights = [hotspot[4] for hotspot in hotspots]
+    categories = list(CategoryEnum)
+    now = datetime.now(timezone.utc)
+
+    for _ in range(count):
+        place, city, lat, lng, _weight = rng.choices(hotspots, weights)[0]
+        lat += rng.gauss(0, ITEM_SPREAD_DEGREES)
+        lng += rng.gauss(0, ITEM_SPREAD_DEGREES)
+
+        category = rng.choice(categories)
+        item_type = ItemType.DEAL if category in (CategoryEnum.SALE, CategoryEnum.GARAGE_SALE) or rng.random() < 0.2 else ItemType.EVENT
+        prefixes, suffixes = TITLES[category]
+        title = f"{rng.choice(prefixes)} {rng.choice(suffixes)}"
+
+        # Mostly upcoming, some running now and some long over
+        start_date = now + timedelta(days=rng.uniform(-90, 180))
+        if item_type == ItemType.EVENT:
+            end_date = start_date + timedelta(hours=rng.choice((1, 2, 3, 4, 6, 8)))
+        else:
+            end_date = start_date + timedelta(days=rng.randint(1, 30))
+        created_at = min(now, start_date) - timedelta(days=rng.uniform(0, 60))
+
+        yield (
+            seeded_uuid(rng),
+            item_type.name,
+            title,
+            rng.choice(DESCRIPTIONS).format(title=title, place=place),
+            category.name,
+            start_date,
+            end_date,
+            f"{place}, {city}",
+            lat,
+            lng,
+            geohash_encode(lat, lng),
+            f"/static/uploads/{seeded_uuid(rng).hex}.jpg" if rng.random() < 0.3 else None,
+            # Views follow a long tail: most items are barely seen
+            min(int(rng.paretovariate(1.1)) - 1, 100_000),
+            rng.choice(user_ids),
+            created_at,
+            created_at,
+        )
+
+
+def batched(rows: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def reset(connection: asyncpg.Connection):
+    pattern = f"%@{BENCHMARK_EMAIL_DOMAIN}"
+    deleted = await connection.execute(
+        "DELETE FROM items WHERE user_id IN (SELECT id FROM users WHERE email LIKE $1)", pattern
+    )
+    await connection.execute("DELETE FROM users WHERE email LIKE $1", pattern)
+    print(f"Removed previous benchmark data ({deleted})")
+
+
+async def generate(scale: float, seed: int, reset_first: bool):
+    rng = random.Random(seed)
+    user_count = max(1, int(USERS_PER_SCALE * scale))
+    item_count = int(ITEMS_PER_SCALE * scale)
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    connection = await asyncpg.connect(dsn)
+    try:
+        if reset_first:
+            await reset(connection)
+
+        started = time.perf_counter()
+        users = generate_users(user_count, get_password_hash(BENCHMARK_PASSWORD), rng)
+        await connection.copy_records_to_table(
+            "users", records=users,
+            columns=["id", "name", "email", "hashed_password", "created_at", "updated_at"],
+        )
+        print(f"Loaded {user_count} users")
+
+        # Build the next batch in a thread while the server ingests the current one
+        loop = asyncio.get_running_loop()
+        batches = batched(generate_items(item_count, [user[0] for user in users], rng), COPY_BATCH_SIZE)
+        pending = loop.run_in_executor(None, next, batches, None)
+        loaded = 0
+        while True:
+            batch = await pending
+            if batch is None:
+                break
+            pending = loop.run_in_executor(None, next, batches, None)
+            await connection.copy_records_to_table("items", records=batch, columns=ITEM_COLUMNS)
+            loaded += len(batch)
+            print(f"Loaded {loaded}/{item_count} items")
+
+        # Fresh statistics so the first benchmark run gets production-like plans
+        await connection.execute("ANALYZE users")
+        await connection.execute("ANALYZE items")
+        elapsed = time.perf_counter() - started
+        print(f"Done in {elapsed:.1f}s ({item_count / elapsed if elapsed else math.inf:,.0f} items/s)")
+        print(f"Sign in as user0@{BENCHMARK_EMAIL_DOMAIN} / {BENCHMARK_PASSWORD}")
+    finally:
+        await connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help=f"Multiples of {ITEMS_PER_SCALE:,} items")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, for reproducible datasets")
+    parser.add_argument("--reset", action="store_true", help="Delete previously generated users and items first")
+    args = parser.parse_args()
+
+    asyncio.run(generate(args.scale, args.seed, args.reset))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Drive a mixed load against a running API and record latency percentiles per endpoint.
+
+    python -m benchmarks.load [--base-url http://localhost:8000] [--concurrency 32]
+        [--duration 60] [--warmup 10] [--mix radius=40,search=15,detail=25,count=10,login=5,upload=5]
+        [--output results/run.json] [--label before-index-change]
+
+Expects data from benchmarks.generate_data (its users sign in and its cities are queried).
+Uploads write real files under app/static/uploads. Compare saved runs with benchmarks.report.
+"""
+import argparse
+import asyncio
+import io
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from PIL import Image
+
+from benchmarks.generate_data import BENCHMARK_EMAIL_DOMAIN, BENCHMARK_PASSWORD, CITIES, TITLES
+from benchmarks.report import format_run, save_run, summarize
+
+DEFAULT_MIX = "radius=40,search=15,detail=25,count=10,login=5,upload=5"
+RADII_KM = (2, 5, 10, 20)
+SEARCH_TERMS = sorted({word.lower() for prefixes, suffixes in TITLES.values() for word in prefixes + suffixes if " " not in word})
+# Item ids collected up front for the detail and count scenarios
+ID_POOL_SIZE = 2000
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def random_point(rng: random.Random):
+    _name, lat, lng, _share = rng.choices(CITIES, [city[3] for city in CITIES])[0]
+    return lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05)
+
+
+def random_jpeg(rng: random.Random) -> bytes:
+    # Distinct content every time, so uploads are not deduplicated
+    image = Image.frombytes("RGB", (64, 64), rng.randbytes(64 * 64 * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+class LoadContext:
+    def __init__(self, client: httpx.AsyncClient, token: str, item_ids: List[str], users: int):
+        self.client = client
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.item_ids = item_ids
+        self.users = users
+
+
+async def scenario_radius(context: LoadContext, rng: random.Random) -> httpx.Response:
+    lat, lng = random_point(rng)
+    return await context.client.get("/api/items/", params={
+        "lat": lat, "lng": lng, "radius": rng.choice(RADII_KM), "view": "summary", "limit": 50,
+    })
+
+
+async def scenario_search(context: LoadContext, rng: random.Random) -> httpx.Response:
+    return await context.client.get("/api/items/", params={"search": rng.choice(SEARCH_TERMS), "limit": 20})
+
+
+async def scenario_detail(context: LoadContext, rng: random.Random) -> httpx.Response:
+    return await context.client.get(f"/api/items/{rng.choice(context.item_ids)}")
+
+
+async def scenario_count(context: LoadContext, rng: random.Random) -> httpx.Response:
+    return await context.client.patch(f"/api/items/{rng.choice(context.item_ids)}/count")
+
+
+async def scenario_login(context: LoadContext, rng: random.Random) -> httpx.Response:
+    return await context.client.post("/api/auth/login", data={
+        "username": f"user{rng.randrange(context.users)}@{BENCHMARK_EMAIL_DOMAIN}",
+        "password": BENCHMARK_PASSWORD,
+    })
+
+
+async def scenario_upload(context: LoadContext, rng: random.Random) -> httpx.Response:
+    files = {"file": ("benchmark.jpg", random_jpeg(rng), "image/jpeg")}
+    return await context.client.post("/api/uploads", files=files, headers=context.auth)
+
+
+SCENARIOS = {
+    "radius": scenario_radius,
+    "search": scenario_search,
+    "detail": scenario_detail,
+    "count": scenario_count,
+    "login": scenario_login,
+    "upload": scenario_upload,
+}
+
+
+async def prepare(client: httpx.AsyncClient, rng: random.Random, users: int) -> LoadContext:
+    response = await client.post("/api/auth/login", data={
+        "username": f"user0@{BENCHMARK_EMAIL_DOMAIN}", "password": BENCHMARK_PASSWORD,
+    })
+    response.raise_for_status()
+    token = response.json()["access_token"]
+
+    item_ids = set()
+    for _ in range(50):
+        if len(item_ids) >= ID_POOL_SIZE:
+            break
+        lat, lng = random_point(rng)
+        listing = await client.get("/api/items/", params={"lat": lat, "lng": lng, "radius": 20, "view": "summary", "limit": 100})
+        listing.raise_for_status()
+        item_ids.update(item["id"] for item in listing.json())
+    if not item_ids:
+        raise SystemExit("No items found near the benchmark cities; run benchmarks.generate_data first")
+    return LoadContext(client, token, sorted(item_ids), users)
+
+
+async def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    rng = random.Random(args.seed)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        context = await prepare(client, rng, args.users)
+        print(f"Prepared {len(context.item_ids)} item ids; warming up for {args.warmup}s")
+
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        deadline = measure_from + args.duration
+
+        async def client_loop(worker: int):
+            worker_rng = random.Random(f"{args.seed}-{worker}")
+            while True:
+                name = worker_rng.choices(names, weights)[0]
+                request_started = time.perf_counter()
+                if request_started >= deadline:
+                    return
+                try:
+                    response = await SCENARIOS[name](context, worker_rng)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                finished = time.perf_counter()
+                # Only requests that started after the warmup count
+                if request_started < measure_from:
+                    continue
+                if failed:
+                    errors[name] += 1
+                else:
+                    latencies[name].append((finished - request_started) * 1000)
+
+        await asyncio.gather(*(client_loop(worker) for worker in range(args.concurrency)))
+
+    scenarios = {
+        name: summarize(latencies[name], errors[name], args.duration)
+        for name in names
+    }
+    all_latencies = [latency for name in names for latency in latencies[name]]
+    return {
+        "meta": {
+            "label": args.label,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+        "total": summarize(all_latencies, sum(errors.values()), args.duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients, each with one request in flight")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Seconds of load before measuring starts")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights, name=weight,...")
+    parser.add_argument("--users", type=int, default=1000, help="Generated users to sign in as (user0..userN-1)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", help="Name for this run, e.g. the change under test")
+    parser.add_argument("--output", help="Write the results as JSON for benchmarks.report")
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = asyncio.run(run(args))
+    print(format_run(result))
+    if args.output:
+        save_run(args.output, result)
+        print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
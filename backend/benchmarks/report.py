@@ -0,0 +1,135 @@
+"""
+Summarize load benchmark results and compare runs.
+
+    python -m benchmarks.report RUN.json                      # print one run
+    python -m benchmarks.report BASELINE.json RUN.json [--threshold 10]
+
+Comparing exits with status 1 when any scenario's p95 or p99 latency rose, or its
+throughput fell, by more than --threshold percent, so it can gate a deploy.
+"""
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import orjson
+
+METRICS = ("requests", "errors", "throughput_rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+# Direction in which each compared metric gets worse
+REGRESSION_METRICS = {"p95_ms": 1, "p99_ms": 1, "throughput_rps": -1}
+
+
+def summarize(latencies_ms: List[float], errors: int, duration_seconds: float) -> Dict[str, float]:
+    """
+    Latency percentiles and throughput for one scenario (or all of them together).
+    """
+    if not latencies_ms:
+        return {"requests": 0, "errors": errors, "throughput_rps": 0.0,
+                "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    samples = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "requests": int(samples.size),
+        "errors": errors,
+        "throughput_rps": round(samples.size / duration_seconds, 2),
+        "mean_ms": round(float(samples.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(samples.max()), 2),
+    }
+
+
+def load_run(path: str) -> dict:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def save_run(path: str, run: dict):
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(run, option=orjson.OPT_INDENT_2))
+
+
+def format_run(run: dict) -> str:
+    meta = run["meta"]
+    lines = [
+        f"{meta.get('label') or 'run'} at {meta['started_at']} (commit {meta.get('commit') or 'unknown'}): "
+        f"{meta['concurrency']} clients for {meta['duration_seconds']}s against {meta['base_url']}",
+        f"{'scenario':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}",
+    ]
+    for name, stats in run["scenarios"].items():
+        lines.append(_format_row(name, stats))
+    lines.append(_format_row("total", run["total"]))
+    return "\n".join(lines)
+
+
+def _format_row(name: str, stats: dict) -> str:
+    return (
+        f"{name:<10} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput_rps']:>9.1f} "
+        f"{stats['mean_ms']:>9.2f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+    )
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+def compare_runs(baseline: dict, current: dict, threshold_percent: float):
+    """
+    Return (report lines, regressions) comparing the scenarios both runs measured.
+    """
+    lines = [
+        f"{'scenario':<10} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>9}",
+    ]
+    regressions = []
+    names = [name for name in baseline["scenarios"] if name in current["scenarios"]] + ["total"]
+    for name in names:
+        before_stats = baseline["total"] if name == "total" else baseline["scenarios"][name]
+        after_stats = current["total"] if name == "total" else current["scenarios"][name]
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = before_stats[metric], after_stats[metric]
+            change = _change(before, after)
+            flag = ""
+            worse = REGRESSION_METRICS.get(metric)
+            if worse is not None and change is not None and change * worse > threshold_percent:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {before} -> {after} ({change:+.1f}%)")
+            change_text = "n/a" if change is None else f"{change:+.1f}%"
+            lines.append(f"{name:<10} {metric:<15} {before:>10.2f} {after:>10.2f} {change_text:>9}{flag}")
+        if after_stats["errors"] > before_stats["errors"]:
+            regressions.append(f"{name} errors: {before_stats['errors']} -> {after_stats['errors']}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("runs", nargs="+", metavar="RUN.json", help="One run to print, or a baseline and a run to compare")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression, in percent")
+    args = parser.parse_args()
+
+    if len(args.runs) == 1:
+        print(format_run(load_run(args.runs[0])))
+        return
+    if len(args.runs) != 2:
+        parser.error("give one run to print or two runs to compare")
+
+    baseline, current = load_run(args.runs[0]), load_run(args.runs[1])
+    for key in ("concurrency", "duration_seconds", "mix"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"Warning: runs differ in {key}; the comparison may not be meaningful")
+
+    lines, regressions = compare_runs(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions over {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
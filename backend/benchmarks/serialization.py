@@ -0,0 +1,107 @@
+"""
+Compare item list serialization paths for a 1,000-item response.
+
+    python -m benchmarks.serialization [--items 1000] [--rounds 20]
+
+Needs the same environment as the app (.env), but no database.
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.item import CategoryEnum, Item, ItemType
+from app.models.user import User  # noqa: F401  (registers the Item.user relationship target)
+from app.schemas.item import ItemResponse
+from app.utils.serializers import serialize_item
+
+
+def make_items(count: int) -> List[Item]:
+    now = datetime.now(timezone.utc)
+    return [
+        Item(
+            id=uuid.uuid4(),
+            type=ItemType.EVENT if i % 2 else ItemType.DEAL,
+            title=f"Sample item {i}",
+            description="Local vendors selling handmade goods, vintage items, and more. " * 4,
+            category=list(CategoryEnum)[i % len(CategoryEnum)],
+            start_date=now + timedelta(days=i % 30),
+            end_date=now + timedelta(days=i % 30, hours=3),
+            address="MG Road, Bangalore",
+            latitude=12.97 + i * 1e-4,
+            longitude=77.59 + i * 1e-4,
+            image=f"/static/uploads/{uuid.uuid4()}.jpg",
+            user_id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            count=i,
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_path(items: List[Item], adapter: TypeAdapter) -> bytes:
+    # Hand-built dicts, then what FastAPI does for response_model: validate, dump, json.dumps
+    dicts = [
+        {
+            "id": str(item.id),
+            "type": item.type.value,
+            "title": item.title,
+            "description": item.description,
+            "category": item.category.value,
+            "startDate": item.start_date.isoformat(),
+            "endDate": item.end_date.isoformat(),
+            "address": item.address,
+            "location": {"lat": item.latitude, "lng": item.longitude},
+            "image": item.image,
+            "createdBy": str(item.user_id),
+            "createdAt": item.created_at.isoformat(),
+            "updatedAt": item.updated_at.isoformat(),
+            "count": item.count,
+            "distance": 1.2,
+        }
+        for item in items
+    ]
+    validated = adapter.validate_python(dicts)
+    content = adapter.dump_python(validated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def fast_path(items: List[Item]) -> bytes:
+    return orjson.dumps([serialize_item(item, 1.23) for item in items])
+
+
+def timed(func, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    adapter = TypeAdapter(List[ItemResponse])
+
+    legacy_ms = timed(lambda: legacy_path(items, adapter), args.rounds)
+    fast_ms = timed(lambda: fast_path(items), args.rounds)
+
+    print(f"{args.items} items, best of {args.rounds} rounds")
+    print(f"  legacy (dict + response_model + json): {legacy_ms:8.2f} ms")
+    print(f"  serialize_item + orjson:               {fast_ms:8.2f} ms")
+    print(f"  speedup:                               {legacy_ms / fast_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
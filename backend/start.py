@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 import sys
 import argparse
@@ -7,17 +8,17 @@ import uvicorn
 
 
 
+from sqlalchemy import select
+
+from app.db.bulk import bulk_insert_items, validate_items
+from app.db.change_feed import change_feed
 from app.db.init_db import init_db
 from app.core.config import settings
 
 
-from app.db.base import Base
-from app.db.session import engine
-
-async def create_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-# await create_tables();
+from app.db.database import async_session
+from app.db.plan_check import check_query_plans
+from app.models.user import User
 
 async def init_database():
     print("Initializing database...")
@@ -25,12 +26,60 @@ async def init_database():
     print("Database initialization complete!")
 
 
+def load_records(path):
+    # A JSON array, or one JSON object per line
+    with open(path) as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+async def bulk_import(path, owner_email):
+    records = load_records(path)
+    print(f"Importing {len(records)} items from {path}...")
+
+    async with async_session() as session:
+        owner = (await session.execute(select(User).where(User.email == owner_email))).scalar_one_or_none()
+        if owner is None:
+            print(f"No user with email {owner_email}")
+            return
+
+        rows, errors = validate_items(records, owner.id)
+        result = await bulk_insert_items(session, rows)
+        await session.commit()
+
+    if result.created:
+        # Running workers rebuild their spatial index and drop cached listings
+        await change_feed.publish_resync()
+
+    errors = sorted(errors + result.errors, key=lambda error: error["index"])
+    for error in errors[:20]:
+        print(f"Row {error['index']}: {error['errors']}")
+    if len(errors) > 20:
+        print(f"... and {len(errors) - 20} more errors")
+    print(f"Import complete: {len(result.created)} created, {len(errors)} failed")
+
+
 def run_migrations():
     print("Running database migrations...")
-    os.system("alembic upgrade head")
+    if os.system("alembic upgrade head") != 0:
+        print("Migrations failed!")
+        sys.exit(1)
     print("Migrations complete!")
 
 
+async def check_plans():
+    print("Checking listing query plans...")
+    async with async_session() as session:
+        failures = await check_query_plans(session, settings.PLAN_CHECK_MAX_SEQ_SCAN_ROWS)
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+    print("Query plans OK!")
+
+
 def start_app(host="0.0.0.0", port=8000, reload=True):
     print(f"Starting {settings.APP_NAME} API on http://{host}:{port}")
     uvicorn.run(
@@ -42,13 +91,22 @@ def start_app(host="0.0.0.0", port=8000, reload=True):
 
 
 async def main():
-    await create_tables()
     parser = argparse.ArgumentParser(description="Neighborhood App Backend")
     parser.add_argument(
         "--init-db", action="store_true", help="Initialize the database"
     )
     parser.add_argument(
-        "--migrate", action="store_true", help="Run database migrations"
+        "--migrate", action="store_true", help="Run database migrations and exit"
+    )
+    parser.add_argument(
+        "--check-plans", action="store_true",
+        help="EXPLAIN every listing filter combination and fail on large sequential scans",
+    )
+    parser.add_argument(
+        "--bulk-import", type=str, metavar="FILE", help="Import items from a JSON array or NDJSON file"
+    )
+    parser.add_argument(
+        "--owner", type=str, default="test@example.com", help="Email of the user who owns imported items"
     )
     parser.add_argument(
         "--host", type=str, default="0.0.0.0", help="Host to run the API on"
@@ -61,14 +119,23 @@ async def main():
     )
     
     args = parser.parse_args()
+    serve = not args.init_db and not args.migrate and not args.bulk_import and not args.check_plans
+
+    # The schema, including its indexes, is owned by the Alembic migrations; apply them
+    # before importing into or serving from it
+    if args.migrate or args.bulk_import or serve:
+        run_migrations()
     
     if args.init_db:
         await init_database()
     
-    if args.migrate:
-        run_migrations()
-    
-    if not args.init_db and not args.migrate:
+    if args.bulk_import:
+        await bulk_import(args.bulk_import, args.owner)
+
+    if args.check_plans:
+        await check_plans()
+
+    if serve:
         start_app(args.host, args.port, not args.no_reload)
 
 
@@ -0,0 +1,12 @@
+import os
+
+# Settings has required fields; unit tests never reach the database
+os.environ.setdefault("APP_NAME", "LocalLoop")
+os.environ.setdefault("APP_VERSION", "test")
+os.environ.setdefault("APP_DESCRIPTION", "LocalLoop tests")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/localloop_test")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("CORS_ORIGINS", '["http://localhost:3000"]')
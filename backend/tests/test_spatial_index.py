@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.utils.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def index():
+    index = SpatialIndex(cell_degrees=0.05)
+    index.ready = True
+    return index
+
+
+def add(index, lat, lng):
+    item_id = uuid4()
+    index.upsert(item_id, lat, lng, datetime.now(timezone.utc) + timedelta(days=1))
+    return item_id
+
+
+@pytest.mark.parametrize("lat", [90.0, 89.99, -90.0, -89.99])
+def test_query_radius_at_the_poles(index, lat):
+    sign = 1 if lat > 0 else -1
+    near = [add(index, sign * 89.995, 0.0), add(index, sign * 89.995, 179.0), add(index, sign * 89.995, -90.0)]
+    far = add(index, sign * 89.0, 0.0)
+
+    found = index.query_radius(lat, 0.0, 5.0)
+
+    assert set(found) == set(near)
+    assert far not in found
+    assert all(distance <= 5.0 for distance in found.values())
+
+
+def test_query_radius_across_the_antimeridian(index):
+    east = add(index, 0.0, 179.95)
+    west = add(index, 0.0, -179.95)
+    far = add(index, 0.0, 179.5)
+
+    found = index.query_radius(0.0, 179.99, 20.0)
+
+    assert set(found) == {east, west}
+    assert far not in found
+    assert found[west] == pytest.approx(6.7, abs=0.1)
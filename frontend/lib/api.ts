@@ -7,6 +7,9 @@ import { mockItems } from "@/lib/mock-data";
 // Base URL for the API
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+// Largest page the items listing serves (ITEMS_MAX_PAGE_SIZE on the backend)
+const PAGE_SIZE = 500;
+
 // Helper function to build query string from filter options
 const buildQueryString = (filters?: FilterOptions): string => {
   if (!filters) return "";
@@ -71,20 +74,34 @@ export const api = {
     // Get all items with optional filtering
     getAll: async (filters?: FilterOptions): Promise<Item[]> => {
       try {
-        const response = await fetch(
-          `${API_BASE_URL}/api/items`,
-          // `${API_BASE_URL}/api/items${buildQueryString(filters)}`,
-          {
-            headers: getAuthHeaders(),
+        // The API returns one page at a time; follow X-Next-Cursor until the last page
+        const items: Item[] = [];
+        let cursor: string | null = null;
+
+        do {
+          const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+          if (cursor) {
+            params.append("cursor", cursor);
           }
-        );
 
-        if (!response.ok) {
-          const errorData = await response.json();
-          throw new Error(errorData.detail || "Failed to fetch items");
-        }
+          const response = await fetch(
+            `${API_BASE_URL}/api/items?${params.toString()}`,
+            // `${API_BASE_URL}/api/items${buildQueryString(filters)}`,
+            {
+              headers: getAuthHeaders(),
+            }
+          );
+
+          if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || "Failed to fetch items");
+          }
 
-        return await response.json();
+          items.push(...(await response.json()));
+          cursor = response.headers.get("X-Next-Cursor");
+        } while (cursor);
+
+        return items;
       } catch (error) {
         console.error("Error fetching items:", error);
         throw error;